@@ -3,14 +3,31 @@ Benzene Oxidation Activity Analysis System
 Streamlit-based web application for automatic analysis of FT-IR benzene intensity data
 """
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import copy
+import hashlib
 import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 import numpy as np
+import pandas as pd
+import pyarrow as pa
 from modules.language import get_text
-from modules.data_processor import BenzeneDataProcessor, get_file_list
-from modules.fitting import SigmoidFitter
-from modules.visualization import create_activity_plot, create_simple_activity_plot, create_timeseries_plot, create_comparison_plot, create_multi_file_comparison_plot, save_plot, get_available_fonts
+from modules.data_processor import BenzeneDataProcessor, get_file_list, open_data_source
+# modules.fitting (scipy) is imported where fits are run, as the first page load doesn't need it
+from modules import visualization
 from modules.settings_manager import SettingsManager, ProtocolSettings, TemperatureStep, CalibrationSettings
 
+try:
+    import xxhash  # Optional: faster hashing of array arguments in cache keys
+except ImportError:
+    xxhash = None
+
+# Debug output to stdout (set APP_DEBUG=1 to enable)
+APP_DEBUG = bool(os.environ.get('APP_DEBUG'))
+
 # Page configuration
 st.set_page_config(
     page_title="Benzene Oxidation Activity Analysis",
@@ -19,67 +36,264 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Max. entries in the data file selectbox (larger folders get a name filter)
+FILE_SELECT_MAX_OPTIONS = 200
+
+# Graph save resolution presets (None = custom value)
+SAVE_DPI_PRESETS = {
+    'Draft / 下書き (150)': 150,
+    'Final / 最終 (600)': 600,
+    'Custom / カスタム': None,
+}
+
+# Session state defaults (applied only for keys not set yet)
+SESSION_DEFAULTS = {
+    'language': 'ja',
+    'analysis_done': False,
+    'default_save_path': r"C:\Users\ginga\OneDrive\画像\グラフ\M2\活性曲線",
+    'default_data_path': r"C:\Users\ginga\OneDrive\ドキュメント\研究室\修士研究\USBデータ\FT-IR",
+    'font_name': 'Times New Roman',
+    'label_fontsize': 25,
+    'tick_fontsize': 25,
+    'legend_fontsize': 20,
+    'calibration_slope': -995.32,
+    'calibration_intercept': 101.36,
+    'default_tx': [20, 50, 80],
+    'multi_file_comparison_done': False,
+    'legend_position': 'upper left',
+    'no_correction_mode': False,
+    'analysis_mode': 'single_file',
+}
+
+# User preference keys restored from user_preferences.json
+USER_PREF_KEYS = (
+    'default_save_path', 'default_data_path', 'font_name', 'label_fontsize', 'tick_fontsize',
+    'legend_fontsize', 'default_tx', 'calibration_slope', 'calibration_intercept'
+)
+
 # Initialize session state
-if 'language' not in st.session_state:
-    st.session_state.language = 'ja'
-if 'analysis_done' not in st.session_state:
-    st.session_state.analysis_done = False
-if 'default_save_path' not in st.session_state:
-    st.session_state.default_save_path = r"C:\Users\ginga\OneDrive\画像\グラフ\M2\活性曲線"
-if 'default_data_path' not in st.session_state:
-    st.session_state.default_data_path = r"C:\Users\ginga\OneDrive\ドキュメント\研究室\修士研究\USBデータ\FT-IR"
-if 'font_name' not in st.session_state:
-    st.session_state.font_name = 'Times New Roman'
-if 'label_fontsize' not in st.session_state:
-    st.session_state.label_fontsize = 25
-if 'tick_fontsize' not in st.session_state:
-    st.session_state.tick_fontsize = 25
-if 'legend_fontsize' not in st.session_state:
-    st.session_state.legend_fontsize = 20
+for key, value in SESSION_DEFAULTS.items():
+    if key not in st.session_state:
+        st.session_state[key] = copy.copy(value)
 if 'settings_manager' not in st.session_state:
     st.session_state.settings_manager = SettingsManager()
 if 'protocol_settings' not in st.session_state:
     st.session_state.protocol_settings = st.session_state.settings_manager.get_default_settings()
-if 'calibration_slope' not in st.session_state:
-    st.session_state.calibration_slope = -995.32
-if 'calibration_intercept' not in st.session_state:
-    st.session_state.calibration_intercept = 101.36
 
 # Load user preferences (paths, fonts, TX values, etc.)
 if 'user_preferences_loaded' not in st.session_state:
     settings_mgr = st.session_state.settings_manager
     user_prefs = settings_mgr.load_user_preferences()
     if user_prefs:
-        if 'default_save_path' in user_prefs:
-            st.session_state.default_save_path = user_prefs['default_save_path']
-        if 'default_data_path' in user_prefs:
-            st.session_state.default_data_path = user_prefs['default_data_path']
-        if 'font_name' in user_prefs:
-            st.session_state.font_name = user_prefs['font_name']
-        if 'label_fontsize' in user_prefs:
-            st.session_state.label_fontsize = user_prefs['label_fontsize']
-        if 'tick_fontsize' in user_prefs:
-            st.session_state.tick_fontsize = user_prefs['tick_fontsize']
-        if 'legend_fontsize' in user_prefs:
-            st.session_state.legend_fontsize = user_prefs['legend_fontsize']
-        if 'default_tx' in user_prefs:
-            st.session_state.default_tx = user_prefs['default_tx']
-        if 'calibration_slope' in user_prefs:
-            st.session_state.calibration_slope = user_prefs['calibration_slope']
-        if 'calibration_intercept' in user_prefs:
-            st.session_state.calibration_intercept = user_prefs['calibration_intercept']
+        st.session_state.update({k: user_prefs[k] for k in USER_PREF_KEYS if k in user_prefs})
     st.session_state.user_preferences_loaded = True
 
-if 'default_tx' not in st.session_state:
-    st.session_state.default_tx = [20, 50, 80]
-if 'multi_file_comparison_done' not in st.session_state:
-    st.session_state.multi_file_comparison_done = False
-if 'legend_position' not in st.session_state:
-    st.session_state.legend_position = 'upper left'
-if 'no_correction_mode' not in st.session_state:
-    st.session_state.no_correction_mode = False
-if 'analysis_mode' not in st.session_state:
-    st.session_state.analysis_mode = 'single_file'
+
+def _hash_ndarray(arr: np.ndarray):
+    """Cache-key hash for NumPy arrays (hashes the buffer in place, no tobytes() copy)"""
+    if arr.dtype.hasobject:
+        return arr.shape, arr.tolist()
+    buffer = np.ascontiguousarray(arr).view(np.uint8)
+    if xxhash is not None:
+        digest = xxhash.xxh3_128(buffer).digest()
+    else:
+        digest = hashlib.blake2b(buffer, digest_size=16).digest()
+    return arr.shape, arr.dtype.str, digest
+
+
+ARRAY_HASH_FUNCS = {np.ndarray: _hash_ndarray}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_file_list(folder: str, extensions: str, folder_mtime: Optional[float]):
+    """
+    Cached directory scan for data files
+
+    folder_mtime is only used as part of the cache key, so adding or removing
+    files in the folder invalidates the cached listing.
+
+    Returns:
+        Tuple of (file names, dict of file name -> file path)
+    """
+    file_list = get_file_list(folder, extensions)
+    file_names = tuple(os.path.basename(f) for f in file_list)
+    return file_names, dict(zip(file_names, file_list))
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_protocol_files(_settings_mgr: SettingsManager, settings_dir: str, settings_dir_mtime: Optional[float]):
+    """
+    Cached list of protocol settings files
+
+    settings_dir_mtime is only used as part of the cache key (see _cached_file_list).
+
+    Returns:
+        List of protocol filenames
+    """
+    return _settings_mgr.list_settings_files()
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_calibration_files(_settings_mgr: SettingsManager, calibration_dir: str,
+                              calibration_dir_mtime: Optional[float]):
+    """
+    Cached list of calibration files
+
+    calibration_dir_mtime is only used as part of the cache key (see _cached_file_list).
+
+    Returns:
+        List of calibration filenames
+    """
+    return _settings_mgr.list_calibration_files()
+
+
+@st.cache_data(show_spinner=False)
+def _cached_protocol(_settings_mgr: SettingsManager, settings_dir: str, filename: str, file_mtime: Optional[float]):
+    """
+    Cached protocol settings file
+
+    file_mtime is only used as part of the cache key, so saving the file again
+    reloads it.
+
+    Returns:
+        ProtocolSettings object or None if the file can't be loaded
+    """
+    return _settings_mgr.load_settings(filename)
+
+
+@st.cache_data(show_spinner=False)
+def _pattern_display_names(protocols: tuple, new_label: str) -> dict:
+    """Display names for the pattern selector (protocol files without .json)"""
+    return {
+        '__new__': f"🆕 {new_label}",
+        **{p: p[:-5] for p in protocols}
+    }
+
+
+@st.cache_resource(show_spinner=False)
+def _cached_fonts():
+    """Available plot fonts (installed fonts don't change while the app is running)"""
+    return visualization.get_available_fonts()
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _cached_processor(slope: float, intercept: float, auto_intercept: bool,
+                      protocol_dict: dict) -> BenzeneDataProcessor:
+    """
+    Shared processor for read-only protocol queries (e.g. expected duration)
+
+    Not used for process_file: auto-intercept mode rewrites conversion_intercept
+    on the instance, so file processing builds its own processor.
+    """
+    return BenzeneDataProcessor(
+        conversion_slope=slope,
+        conversion_intercept=intercept,
+        protocol_settings=ProtocolSettings.from_dict(protocol_dict),
+        auto_intercept=auto_intercept
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _process_data_file(file_path, file_mtime: Optional[float], slope: float, intercept: float,
+                       auto_intercept: bool, protocol_dict: dict, semi_auto: bool):
+    """
+    Cached file processing (standard or semi-auto mode)
+
+    file_path is a path or an UploadedFile (hashed by content). file_mtime is only
+    used as part of the cache key, so re-running the analysis with unchanged
+    inputs skips re-reading and re-processing the data file.
+
+    Returns:
+        Result of BenzeneDataProcessor.process_file or process_file_semi_auto
+    """
+    processor = BenzeneDataProcessor(
+        conversion_slope=slope,
+        conversion_intercept=intercept,
+        protocol_settings=ProtocolSettings.from_dict(protocol_dict),
+        auto_intercept=auto_intercept
+    )
+    if semi_auto:
+        return processor.process_file_semi_auto(file_path)
+    return processor.process_file(file_path)
+
+
+@st.cache_data(show_spinner=False, max_entries=32, hash_funcs=ARRAY_HASH_FUNCS)
+def _cached_figure(plot_func_name: str, *args, **kwargs):
+    """
+    Cached matplotlib figure from modules.visualization
+
+    All arguments (plot data and display settings) are part of the cache key, so
+    reruns that don't change the plot skip building it. Every call gets its own
+    copy of the Figure (unpickled from the cache), so callers can draw it without
+    affecting other sessions.
+
+    Args:
+        plot_func_name: Name of the create_*_plot function in modules.visualization
+        *args, **kwargs: Arguments passed to the plot function
+
+    Returns:
+        matplotlib Figure
+    """
+    return getattr(visualization, plot_func_name)(*args, **kwargs)
+
+
+@st.cache_data(show_spinner=False, hash_funcs=ARRAY_HASH_FUNCS)
+def _fit_sigmoid(temperatures: np.ndarray, conversions: np.ndarray):
+    """
+    Cached sigmoid fit (keyed on the contents of the data arrays)
+
+    Returns:
+        Tuple of (success, fitted SigmoidFitter)
+    """
+    from modules.fitting import SigmoidFitter
+
+    fitter = SigmoidFitter()
+    success = fitter.fit(temperatures, conversions)
+    if success:
+        # Evaluate the fitted curve here so it is stored with the cached fitter
+        fitter.get_fitted_curve()
+    return success, fitter
+
+
+def process_sample_file(file_path: str, sample_name: str, slope: float, intercept: float,
+                        auto_intercept: bool, protocol_dict: dict, tx_values: list) -> dict:
+    """
+    Process and fit one file for the multi-file comparison
+
+    Does not touch st.session_state, so it can run in a worker thread.
+
+    Returns:
+        Sample entry dict (name, temperatures, conversions, detailed_df, fitting_success
+        and, if the fit succeeded, temp_fit, conv_fit, r_squared, fitting_params, tx_results)
+    """
+    # Process file (cached, with auto_intercept per file)
+    temperatures, conversions, detailed_df, times, intensities, temp_data = _process_data_file(
+        file_path,
+        os.path.getmtime(file_path),
+        slope,
+        intercept,
+        auto_intercept,
+        protocol_dict,
+        semi_auto=False
+    )
+
+    # Fit sigmoid
+    success, fitter = _fit_sigmoid(temperatures, conversions)
+
+    sample_entry = {
+        'name': sample_name,
+        'temperatures': temperatures,
+        'conversions': conversions,
+        'detailed_df': detailed_df
+    }
+
+    if success:
+        sample_entry.update(fitter.finalize(tx_values))
+        sample_entry['fitting_success'] = True
+    else:
+        sample_entry['fitting_success'] = False
+
+    return sample_entry
 
 
 def save_user_prefs():
@@ -99,12 +313,497 @@ def save_user_prefs():
         'calibration_intercept': st.session_state.get('calibration_intercept_input', st.session_state.get('calibration_intercept', 101.36))
     }
 
+    # Skip the file write when nothing changed since the last save
+    if prefs == st.session_state.get('_last_saved_prefs'):
+        return
+
     settings_mgr.save_user_preferences(prefs)
+    st.session_state._last_saved_prefs = prefs
+
+
+def mark_user_prefs_dirty():
+    """Widget callback: defer saving user preferences to the start of the next run"""
+    st.session_state._prefs_dirty = True
+
+
+def as_plot_array(values) -> np.ndarray:
+    """Contiguous float32 array for plot data kept in session_state (halves its size)"""
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+def stack_reactor_arrays(reactor_data: dict, reactor_ids: list) -> tuple:
+    """
+    Per-reactor temperatures/conversions as two 2D plot arrays (row = reactor)
+
+    Rows are NaN-padded to the longest reactor so they can be stacked.
+    """
+    width = max((len(reactor_data[rid]['temperatures']) for rid in reactor_ids), default=0)
+    temperatures = np.full((len(reactor_ids), width), np.nan, dtype=np.float32)
+    conversions = np.full((len(reactor_ids), width), np.nan, dtype=np.float32)
+    for i, rid in enumerate(reactor_ids):
+        n = len(reactor_data[rid]['temperatures'])
+        temperatures[i, :n] = reactor_data[rid]['temperatures']
+        conversions[i, :n] = reactor_data[rid]['conversions']
+    return temperatures, conversions
+
+
+def detailed_display_df(detailed_df: pd.DataFrame, text: dict) -> pd.DataFrame:
+    """
+    Per-temperature data table with localized column headers
+
+    Only the column labels are replaced; the returned frame shares its data with
+    detailed_df instead of copying it.
+    """
+    display_df = detailed_df.copy(deep=False)
+    display_df.columns = [
+        f"{text['temperature']} ({text['temp_unit']})",
+        text['intensity_avg'],
+        f"{text['conversion']} (%)",
+        text['data_points']
+    ]
+    return display_df
+
+
+def detailed_display_table(table_key: tuple, detailed_df: pd.DataFrame, text: dict) -> pa.Table:
+    """
+    Arrow version of detailed_display_df, converted once per result and language
+
+    The tables are kept in st.session_state.arrow_tables, which is reset whenever
+    a new analysis is run.
+
+    Args:
+        table_key: Identifies the result the table belongs to (e.g. ('reactor', 1))
+        detailed_df: Per-temperature data
+        text: UI text for the current language
+
+    Returns:
+        pyarrow Table ready for st.dataframe
+    """
+    tables = st.session_state.setdefault('arrow_tables', {})
+    key = (*table_key, st.session_state.language)
+    if key not in tables:
+        tables[key] = pa.Table.from_pandas(detailed_display_df(detailed_df, text), preserve_index=False)
+    return tables[key]
+
+
+def tx_results_table(tx_results: dict, text: dict):
+    """
+    TX results of one fit as a table (1 decimal, "cannot calculate" for missing values)
+
+    Returns:
+        pandas Styler for st.table
+    """
+    temp_column = f"{text['temperature']} ({text['temp_unit']})"
+    tx_series = pd.Series(tx_results, dtype=np.float64).sort_index()
+    tx_df = pd.DataFrame({'TX': tx_series.index, temp_column: tx_series.to_numpy()})
+    return tx_df.style.format({temp_column: "{:.1f}"}, na_rep=text['cannot_calc'])
+
+
+def build_tx_table(label_column: str, labels: list, tx_results_list: list,
+                   fitting_error_text: str, r_squared: Optional[list] = None) -> pd.DataFrame:
+    """
+    Build a TX comparison table (one row per reactor / sample)
+
+    Args:
+        label_column: Header of the first column (reactor / sample name)
+        labels: Row labels
+        tx_results_list: TX results dict per row, or None if fitting failed
+        fitting_error_text: Status text for rows where fitting failed
+        r_squared: Optional R² per row (None if fitting failed)
+
+    Returns:
+        DataFrame with TX values formatted to 1 decimal ("-" if not calculable)
+    """
+    failed = np.array([tx is None for tx in tx_results_list], dtype=bool)
+    tx_df = pd.DataFrame.from_records([tx or {} for tx in tx_results_list], index=range(len(labels)))
+    tx_df = tx_df[sorted(tx_df.columns)].astype(np.float64)
+
+    table = pd.DataFrame(np.char.mod("%.1f", tx_df.to_numpy()), index=tx_df.index, columns=tx_df.columns)
+    table = table.where(tx_df.notna(), "-")
+    table[failed] = ""
+    table.insert(0, label_column, labels)
+
+    if r_squared is not None:
+        r2 = pd.Series(r_squared, dtype=np.float64)
+        table['R²'] = r2.map("{:.4f}".format).where(~failed, "")
+    if failed.any():
+        table['Status'] = np.where(failed, fitting_error_text, "")
+    return table
+
+
+def select_save_dpi(key_prefix: str) -> int:
+    """
+    DPI widgets for saving graphs (preset + custom value)
+
+    Args:
+        key_prefix: Prefix for the widget keys
+
+    Returns:
+        Selected DPI
+    """
+    preset = st.radio(
+        "DPI (解像度)",
+        options=list(SAVE_DPI_PRESETS.keys()),
+        index=1,
+        horizontal=True,
+        key=f'{key_prefix}_dpi_preset'
+    )
+    dpi_value = SAVE_DPI_PRESETS[preset]
+    if dpi_value is None:
+        dpi_value = st.number_input(
+            "Custom DPI",
+            min_value=150,
+            max_value=1200,
+            value=600,
+            step=50,
+            help="Higher DPI = Higher quality (default: 600)",
+            key=f'{key_prefix}_dpi_input'
+        )
+    return dpi_value
+
+
+@st.fragment
+def render_results(text: dict):
+    """
+    Render single-file analysis results (tables, plots and graph saving)
+
+    Runs as a fragment, so interacting with the widgets in here only reruns
+    this function instead of the whole app.
+
+    Args:
+        text: UI text for the current language
+    """
+    st.success(text['results_title'])
+
+    # Show protocol info
+    protocol = st.session_state.protocol_settings
+    is_semi_auto_display = getattr(protocol, 'mode', 'standard') == 'semi_auto'
+
+    with st.expander(f"📋 {text['protocol_settings']}: {protocol.name}", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(text['num_steps'], len(protocol.steps))
+        with col2:
+            st.metric(text['ramp_time'], f"{protocol.ramp_time} min")
+        with col3:
+            st.metric(text['analysis_time'], f"{protocol.analysis_time} min")
+
+        # Show step details
+        steps_df = pd.DataFrame({
+            text['step']: np.arange(1, len(protocol.steps) + 1),
+            f"{text['temperature']} (℃)": [step.temperature for step in protocol.steps],
+            f"{text['hold_time']}": [f"{step.hold_time} min" for step in protocol.steps]
+        })
+        if is_semi_auto_display:
+            steps_df[text['reactor']] = [getattr(step, 'reactor_id', 1) for step in protocol.steps]
+        st.table(steps_df)
+
+    # Check if semi-auto mode results
+    if st.session_state.get('is_semi_auto_mode', False):
+        # Semi-auto mode: display with tabs for each reactor
+        reactor_data = st.session_state.reactor_data
+        fitting_results = st.session_state.fitting_results
+        reactor_ids = st.session_state.reactor_ids
+        num_reactors = len(reactor_data)
+
+        # Create tabs for each reactor + comparison tab
+        tab_names = [text['reactor_n'].format(rid) for rid in reactor_ids]
+        tab_names.append(text['comparison'])
+        tabs = st.tabs(tab_names)
+
+        # Store figures for saving
+        reactor_figs = {}
+
+        # Display each reactor's results in its tab
+        for tab_idx, reactor_id in enumerate(reactor_ids):
+            with tabs[tab_idx]:
+                data = reactor_data[reactor_id]
+                fit_result = fitting_results.get(reactor_id, {})
+
+                if fit_result.get('success', False):
+                    # Create two columns for results
+                    col1, col2 = st.columns(2)
+
+                    with col1:
+                        # Fitting parameters
+                        st.subheader(text['fitting_results'])
+                        params = fit_result['fitting_params']
+
+                        st.metric(text['max_conv'], f"{params['a_max_conversion']:.2f} %")
+                        st.metric(text['growth_rate'], f"{params['b_growth_rate']:.4f}")
+                        st.metric(text['inflection_temp'], f"{params['c_inflection_temp']:.1f} {text['temp_unit']}")
+                        st.metric(text['min_conv'], f"{params['d_min_conversion']:.2f} %")
+                        st.metric(text['r_squared'], f"{params['r_squared']:.4f}")
+
+                    with col2:
+                        # TX results
+                        st.subheader(text['tx_results'])
+                        st.table(tx_results_table(fit_result['tx_results'], text))
+
+                    st.divider()
+
+                    # Activity plot with fitting
+                    st.subheader(text['graph_title'])
+                    fig = _cached_figure(
+                        'create_activity_plot',
+                        data['temperatures'],
+                        data['conversions'],
+                        fit_result['temp_fit'],
+                        fit_result['conv_fit'],
+                        fit_result['tx_results'],
+                        fit_result['r_squared'],
+                        language=st.session_state.language,
+                        font_name=st.session_state.font_name,
+                        label_fontsize=st.session_state.label_fontsize,
+                        tick_fontsize=st.session_state.tick_fontsize,
+                        legend_fontsize=st.session_state.legend_fontsize
+                    )
+                    reactor_figs[reactor_id] = fig
+                    st.pyplot(fig)
+
+                else:
+                    st.warning(text['fitting_error'])
+
+                    # Simple plot without fitting
+                    st.subheader(text['graph_title'])
+                    fig = _cached_figure(
+                        'create_simple_activity_plot',
+                        data['temperatures'],
+                        data['conversions'],
+                        language=st.session_state.language,
+                        font_name=st.session_state.font_name,
+                        label_fontsize=st.session_state.label_fontsize,
+                        tick_fontsize=st.session_state.tick_fontsize,
+                        legend_fontsize=st.session_state.legend_fontsize
+                    )
+                    reactor_figs[reactor_id] = fig
+                    st.pyplot(fig)
+
+                # Temperature data table
+                st.subheader(text['temp_data_title'])
+                display_table = detailed_display_table(('reactor', reactor_id), data['detailed_df'], text)
+                st.dataframe(display_table, use_container_width=True)
+
+        # Comparison tab
+        with tabs[-1]:
+            # Time-series plot with reactor colors
+            st.subheader(text['timeseries_title'])
+            st.caption(text['timeseries_desc'])
+
+            timeseries_fig = _cached_figure(
+                'create_timeseries_plot',
+                st.session_state.times,
+                st.session_state.intensities,
+                st.session_state.temp_data,
+                language=st.session_state.language,
+                font_name=st.session_state.font_name,
+                label_fontsize=st.session_state.label_fontsize,
+                tick_fontsize=st.session_state.tick_fontsize,
+                semi_auto_mode=True,
+                num_reactors=num_reactors
+            )
+            st.pyplot(timeseries_fig)
+
+            st.divider()
+
+            # Comparison plot
+            st.subheader(text['graph_title'])
+            comparison_fig = _cached_figure(
+                'create_comparison_plot',
+                *st.session_state.reactor_arrays,
+                reactor_ids,
+                fitting_results,
+                language=st.session_state.language,
+                font_name=st.session_state.font_name,
+                label_fontsize=st.session_state.label_fontsize,
+                tick_fontsize=st.session_state.tick_fontsize,
+                legend_fontsize=st.session_state.legend_fontsize
+            )
+            st.pyplot(comparison_fig)
+
+            st.divider()
+
+            # TX comparison table
+            st.subheader(text['comparison_table'])
+            comparison_df = build_tx_table(
+                text['reactor'],
+                reactor_ids,
+                [fitting_results.get(rid, {}).get('tx_results') if fitting_results.get(rid, {}).get('success', False) else None
+                 for rid in reactor_ids],
+                text['fitting_error']
+            )
+            st.table(comparison_df)
+
+        # Store the main figure for saving (comparison plot)
+        fig = comparison_fig
+
+    else:
+        # Standard mode display (original code)
+        # Only show fitting results if fitting succeeded
+        if st.session_state.get('fitting_success', False):
+            # Create two columns for results
+            col1, col2 = st.columns(2)
+
+            with col1:
+                # Fitting parameters
+                st.subheader(text['fitting_results'])
+                params = st.session_state.fitting_params
+
+                st.metric(
+                    text['max_conv'],
+                    f"{params['a_max_conversion']:.2f} %"
+                )
+                st.metric(
+                    text['growth_rate'],
+                    f"{params['b_growth_rate']:.4f}"
+                )
+                st.metric(
+                    text['inflection_temp'],
+                    f"{params['c_inflection_temp']:.1f} {text['temp_unit']}"
+                )
+                st.metric(
+                    text['min_conv'],
+                    f"{params['d_min_conversion']:.2f} %"
+                )
+                st.metric(
+                    text['r_squared'],
+                    f"{params['r_squared']:.4f}"
+                )
+
+            with col2:
+                # TX results
+                st.subheader(text['tx_results'])
+                st.table(tx_results_table(st.session_state.tx_results, text))
+
+            st.divider()
+
+        # Time-series plot
+        st.subheader(text['timeseries_title'])
+        st.caption(text['timeseries_desc'])
+
+        # Create time-series plot
+        timeseries_fig = _cached_figure(
+            'create_timeseries_plot',
+            st.session_state.times,
+            st.session_state.intensities,
+            st.session_state.temp_data,
+            language=st.session_state.language,
+            font_name=st.session_state.font_name,
+            label_fontsize=st.session_state.label_fontsize,
+            tick_fontsize=st.session_state.tick_fontsize
+        )
+
+        # Display time-series plot
+        st.pyplot(timeseries_fig)
+
+        # Temperature data table
+        st.subheader(text['temp_data_title'])
+        display_table = detailed_display_table(('single',), st.session_state.detailed_df, text)
+        st.dataframe(display_table, use_container_width=True)
+
+        # Activity plot - show regardless of fitting success
+        st.divider()
+
+        # Graph
+        st.subheader(text['graph_title'])
+
+        # Create plot based on fitting success
+        if st.session_state.get('fitting_success', False):
+            # Create plot with fitting curve
+            fig = _cached_figure(
+                'create_activity_plot',
+                st.session_state.temperatures,
+                st.session_state.conversions,
+                st.session_state.temp_fit,
+                st.session_state.conv_fit,
+                st.session_state.tx_results,
+                st.session_state.fitting_params['r_squared'],
+                language=st.session_state.language,
+                font_name=st.session_state.font_name,
+                label_fontsize=st.session_state.label_fontsize,
+                tick_fontsize=st.session_state.tick_fontsize,
+                legend_fontsize=st.session_state.legend_fontsize
+            )
+        else:
+            # Create simple plot with experimental data only
+            fig = _cached_figure(
+                'create_simple_activity_plot',
+                st.session_state.temperatures,
+                st.session_state.conversions,
+                language=st.session_state.language,
+                font_name=st.session_state.font_name,
+                label_fontsize=st.session_state.label_fontsize,
+                tick_fontsize=st.session_state.tick_fontsize,
+                legend_fontsize=st.session_state.legend_fontsize
+            )
+
+        # Display plot
+        st.pyplot(fig)
+
+    st.divider()
+
+    # Save graph section
+    st.subheader(text['save_graph'])
+
+    # DPI setting (outside the form so the custom value input appears right away)
+    dpi_value = select_save_dpi('single')
+
+    # Folder/file name edits are only applied when the form is submitted
+    with st.form('save_form', clear_on_submit=False, border=False):
+        # Create columns for save settings
+        save_col1, save_col2 = st.columns(2)
+
+        with save_col1:
+            # Save folder path setting (same style as data folder)
+            st.text_input(
+                text['save_folder_custom'],
+                value=st.session_state.default_save_path,
+                help="Path to save graphs",
+                key='save_folder_input'
+            )
+
+        with save_col2:
+            # File name
+            save_filename = st.text_input(
+                "File name (without extension) / ファイル名（拡張子なし）",
+                value=st.session_state.file_name_base
+            )
+
+        # Save button
+        save_clicked = st.form_submit_button(text['save_graph'], type="primary")
+
+    # Update default_save_path from widget state
+    if 'save_folder_input' in st.session_state:
+        st.session_state.default_save_path = st.session_state.save_folder_input
+        save_directory = st.session_state.save_folder_input
+    else:
+        save_directory = st.session_state.default_save_path
+
+    if save_clicked:
+        # Save the preferences here: a fragment-only rerun doesn't reach the
+        # deferred save in main()
+        save_user_prefs()
+
+        try:
+            # Create full file path
+            full_path = os.path.join(save_directory, f"{save_filename}.png")
+
+            # Save plot with specified DPI
+            visualization.save_plot(fig, full_path, dpi=dpi_value)
+
+            st.success(f"{text['graph_saved']}: {full_path}")
+
+        except Exception as e:
+            st.error(f"{text['error']}: {str(e)}")
 
 
 def main():
     """Main application"""
 
+    # Write user preferences once per run, however many widgets changed
+    if st.session_state.pop('_prefs_dirty', False):
+        save_user_prefs()
+
     # Sidebar - Settings
     with st.sidebar:
         # Language selection
@@ -147,15 +846,16 @@ def main():
         with st.expander(text['protocol_settings'], expanded=False):
             settings_mgr = st.session_state.settings_manager
 
-            # Get available patterns
-            available_protocols = settings_mgr.list_settings_files()
+            # Get available patterns (cached, refreshed when the settings folder changes)
+            try:
+                settings_dir_mtime = os.path.getmtime(settings_mgr.settings_dir)
+            except OSError:
+                settings_dir_mtime = None
+            available_protocols = _cached_protocol_files(settings_mgr, settings_mgr.settings_dir, settings_dir_mtime)
 
             # Create pattern options (add "New Pattern" option)
             pattern_options = ['__new__'] + available_protocols
-            pattern_display_names = {
-                '__new__': f"🆕 {text['new_pattern']}",
-                **{p: p.replace('.json', '') for p in available_protocols}
-            }
+            pattern_display_names = _pattern_display_names(tuple(available_protocols), text['new_pattern'])
 
             # Initialize current_pattern_file if not exists
             if 'current_pattern_file' not in st.session_state:
@@ -172,11 +872,13 @@ def main():
 
             # Check if pattern selection changed
             if selected_pattern != st.session_state.current_pattern_file:
-                print(f"[DEBUG] Pattern changed from '{st.session_state.current_pattern_file}' to '{selected_pattern}'")
+                if APP_DEBUG:
+                    print(f"[DEBUG] Pattern changed from '{st.session_state.current_pattern_file}' to '{selected_pattern}'")
                 st.session_state.current_pattern_file = selected_pattern
 
                 if selected_pattern == '__new__':
-                    print("[DEBUG] Creating new pattern with default settings")
+                    if APP_DEBUG:
+                        print("[DEBUG] Creating new pattern with default settings")
                     # Create new pattern with default settings
                     st.session_state.protocol_settings = ProtocolSettings(
                         name="New Pattern",
@@ -195,44 +897,36 @@ def main():
                     )
                     st.session_state.editing_new = True
                 elif selected_pattern:
-                    print(f"[DEBUG] Loading pattern: {selected_pattern}")
+                    if APP_DEBUG:
+                        print(f"[DEBUG] Loading pattern: {selected_pattern}")
                     # Load selected pattern
-                    loaded = settings_mgr.load_settings(selected_pattern)
+                    try:
+                        protocol_mtime = os.path.getmtime(os.path.join(settings_mgr.settings_dir, selected_pattern))
+                    except OSError:
+                        protocol_mtime = None
+                    loaded = _cached_protocol(settings_mgr, settings_mgr.settings_dir, selected_pattern, protocol_mtime)
                     if loaded:
-                        print(f"[DEBUG] Pattern loaded successfully: {loaded.name}")
-                        print(f"[DEBUG] Steps: {len(loaded.steps)} steps")
-                        print(f"[DEBUG] First step temp: {loaded.steps[0].temperature if loaded.steps else 'N/A'}")
+                        if APP_DEBUG:
+                            print(f"[DEBUG] Pattern loaded successfully: {loaded.name}")
+                            print(f"[DEBUG] Steps: {len(loaded.steps)} steps")
+                            print(f"[DEBUG] First step temp: {loaded.steps[0].temperature if loaded.steps else 'N/A'}")
                         st.session_state.protocol_settings = loaded
                         st.session_state.editing_new = False
                     else:
                         st.error(f"Failed to load pattern: {selected_pattern}")
 
-                print("[DEBUG] Clearing widget states...")
-                # Clear form widget states to force refresh
-                keys_to_clear = ['protocol_name_input', 'ramp_time_input', 'analysis_time_input', 'num_steps_input']
-                for key in keys_to_clear:
-                    if key in st.session_state:
-                        print(f"[DEBUG] Deleting key: {key}")
-                        del st.session_state[key]
-
-                # Clear temperature and hold time keys
-                for i in range(20):  # Max 20 steps
-                    temp_key = f'temp_{i}'
-                    hold_key = f'hold_{i}'
-                    if temp_key in st.session_state:
-                        print(f"[DEBUG] Deleting key: {temp_key}")
-                        del st.session_state[temp_key]
-                    if hold_key in st.session_state:
-                        print(f"[DEBUG] Deleting key: {hold_key}")
-                        del st.session_state[hold_key]
-
-                print("[DEBUG] Calling st.rerun()...")
+                # No widget state to clear: the editor widget keys include pattern_key,
+                # so the rerun renders fresh widgets for the newly selected pattern
+                if APP_DEBUG:
+                    print("[DEBUG] Calling st.rerun()...")
                 st.rerun()
 
             # Delete button (only show if not editing new and not default)
             if st.session_state.current_pattern_file != '__new__' and st.session_state.current_pattern_file != 'default.json':
                 if st.button(f"🗑️ {text['delete_protocol']}", key='del_btn'):
                     if settings_mgr.delete_settings(st.session_state.current_pattern_file):
+                        _cached_protocol_files.clear()
+                        _cached_protocol.clear()
                         st.success(text['protocol_deleted'])
                         st.session_state.current_pattern_file = 'default.json'
                         st.session_state.protocol_settings = settings_mgr.get_default_settings()
@@ -246,9 +940,10 @@ def main():
             # Use pattern file as part of widget keys to force refresh when pattern changes
             pattern_key = st.session_state.current_pattern_file.replace('.json', '').replace('/', '_')
 
-            print(f"[DEBUG] Rendering widgets with pattern_key: {pattern_key}")
-            print(f"[DEBUG] Current protocol name: {current_protocol.name}")
-            print(f"[DEBUG] Current protocol steps: {len(current_protocol.steps)}")
+            if APP_DEBUG:
+                print(f"[DEBUG] Rendering widgets with pattern_key: {pattern_key}")
+                print(f"[DEBUG] Current protocol name: {current_protocol.name}")
+                print(f"[DEBUG] Current protocol steps: {len(current_protocol.steps)}")
 
             # Measurement mode selection
             mode_options = {
@@ -284,117 +979,89 @@ def main():
 
             st.divider()
 
-            # Protocol name
-            protocol_name = st.text_input(
-                text['protocol_name'],
-                value=current_protocol.name,
-                key=f'protocol_name_input_{pattern_key}'
-            )
-
-            # Common parameters
-            col1, col2 = st.columns(2)
-
-            with col1:
-                ramp_time = st.number_input(
-                    text['ramp_time'],
-                    min_value=0,
-                    max_value=60,
-                    value=current_protocol.ramp_time,
-                    step=1,
-                    help=text['ramp_time_help'],
-                    key=f'ramp_time_input_{pattern_key}'
-                )
-
-            with col2:
-                analysis_time = st.number_input(
-                    text['analysis_time'],
-                    min_value=1,
-                    max_value=60,
-                    value=current_protocol.analysis_time,
-                    step=1,
-                    help=text['analysis_time_help'],
-                    key=f'analysis_time_input_{pattern_key}'
+            # Editor inputs are applied together when the protocol is saved
+            with st.form(f'protocol_form_{pattern_key}', border=False):
+                # Protocol name
+                protocol_name = st.text_input(
+                    text['protocol_name'],
+                    value=current_protocol.name,
+                    key=f'protocol_name_input_{pattern_key}'
                 )
 
-            # Number of steps
-            num_steps = st.number_input(
-                text['num_steps'],
-                min_value=1,
-                max_value=20,
-                value=len(current_protocol.steps),
-                step=1,
-                key=f'num_steps_input_{pattern_key}'
-            )
-
-            # Temperature steps
-            steps = []
-            for i in range(num_steps):
-                st.markdown(f"**{text['step']} {i+1}**")
-
-                if is_semi_auto:
-                    col_temp, col_hold, col_reactor = st.columns([2, 2, 1])
-                else:
-                    col_temp, col_hold = st.columns(2)
+                # Common parameters
+                col1, col2 = st.columns(2)
 
-                with col_temp:
-                    if i < len(current_protocol.steps):
-                        default_temp = current_protocol.steps[i].temperature
-                    else:
-                        # Use previous step's temperature minus 50, or fallback to safe value
-                        if i > 0 and len(steps) > 0:
-                            default_temp = max(50.0, steps[-1].temperature - 50)
-                        else:
-                            default_temp = max(50.0, 500 - i * 50)
-
-                    temp = st.number_input(
-                        f"{text['temperature']} (℃)",
-                        min_value=0.0,
-                        max_value=1000.0,
-                        value=float(default_temp),
-                        step=10.0,
-                        key=f'temp_{i}_{pattern_key}'
+                with col1:
+                    ramp_time = st.number_input(
+                        text['ramp_time'],
+                        min_value=0,
+                        max_value=60,
+                        value=current_protocol.ramp_time,
+                        step=1,
+                        help=text['ramp_time_help'],
+                        key=f'ramp_time_input_{pattern_key}'
                     )
 
-                with col_hold:
-                    if i < len(current_protocol.steps):
-                        default_hold = current_protocol.steps[i].hold_time
-                    else:
-                        default_hold = 20
-
-                    hold = st.number_input(
-                        f"{text['hold_time']}",
+                with col2:
+                    analysis_time = st.number_input(
+                        text['analysis_time'],
                         min_value=1,
-                        max_value=180,
-                        value=default_hold,
+                        max_value=60,
+                        value=current_protocol.analysis_time,
                         step=1,
-                        key=f'hold_{i}_{pattern_key}'
+                        help=text['analysis_time_help'],
+                        key=f'analysis_time_input_{pattern_key}'
                     )
 
-                # Reactor selection (only for semi-auto mode)
-                if is_semi_auto:
-                    with col_reactor:
-                        if i < len(current_protocol.steps):
-                            default_reactor = getattr(current_protocol.steps[i], 'reactor_id', 1)
-                        else:
-                            # Alternate reactors by default
-                            default_reactor = (i % num_reactors) + 1
-
-                        reactor_id = st.selectbox(
-                            text['reactor'],
-                            options=list(range(1, num_reactors + 1)),
-                            index=min(default_reactor - 1, num_reactors - 1),
-                            key=f'reactor_{i}_{pattern_key}'
-                        )
-                else:
-                    reactor_id = 1
-
-                steps.append(TemperatureStep(temperature=temp, hold_time=hold, reactor_id=reactor_id))
-
-            st.divider()
+                # Temperature steps: one editable grid (rows can be added/removed)
+                label_temp = f"{text['temperature']} (℃)"
+                label_hold = f"{text['hold_time']}"
+                steps_editor_df = pd.DataFrame(
+                    {
+                        'temperature': [float(step.temperature) for step in current_protocol.steps],
+                        'hold_time': [int(step.hold_time) for step in current_protocol.steps],
+                        'reactor_id': [int(getattr(step, 'reactor_id', 1)) for step in current_protocol.steps],
+                    },
+                    index=pd.RangeIndex(1, len(current_protocol.steps) + 1, name=text['step'])
+                )
+                steps_column_config = {
+                    'temperature': st.column_config.NumberColumn(label_temp, min_value=0.0, max_value=1000.0, step=10.0),
+                    'hold_time': st.column_config.NumberColumn(label_hold, min_value=1, max_value=180, step=1),
+                    'reactor_id': st.column_config.SelectboxColumn(text['reactor'], options=list(range(1, num_reactors + 1))),
+                }
+                edited_steps = st.data_editor(
+                    steps_editor_df,
+                    num_rows="dynamic",
+                    column_config=steps_column_config,
+                    column_order=['temperature', 'hold_time', 'reactor_id'] if is_semi_auto else ['temperature', 'hold_time'],
+                    key=f'steps_editor_{pattern_key}'
+                )
 
-            # Save protocol
-            if st.button(text['save_protocol'], key='save_btn', type='primary'):
-                if protocol_name.strip():
+                # Save protocol
+                save_protocol_clicked = st.form_submit_button(text['save_protocol'], type='primary')
+
+            if save_protocol_clicked:
+                # Fill cells left empty in added rows with the same defaults the
+                # step inputs used: previous temperature - 50, 20 min hold, alternating reactors
+                steps = []
+                for i, (temp, hold, reactor_id) in enumerate(edited_steps[['temperature', 'hold_time', 'reactor_id']].itertuples(index=False)):
+                    if pd.isna(temp):
+                        temp = max(50.0, steps[-1].temperature - 50) if steps else max(50.0, 500 - i * 50)
+                    if pd.isna(hold):
+                        hold = 20
+                    if not is_semi_auto:
+                        reactor_id = 1
+                    elif pd.isna(reactor_id):
+                        reactor_id = (i % num_reactors) + 1
+                    steps.append(TemperatureStep(temperature=float(temp), hold_time=int(hold),
+                                                 reactor_id=min(int(reactor_id), num_reactors)))
+
+                if not protocol_name.strip():
+                    st.error(text['enter_protocol_name'])
+                elif not 1 <= len(steps) <= 20:
+                    # A protocol has 1-20 steps
+                    st.error(text['invalid_num_steps'])
+                else:
                     new_protocol = ProtocolSettings(
                         name=protocol_name,
                         steps=steps,
@@ -410,6 +1077,8 @@ def main():
                     # Save to file
                     filename = f"{protocol_name}.json" if not protocol_name.endswith('.json') else protocol_name
                     settings_mgr.save_settings(new_protocol, filename)
+                    _cached_protocol_files.clear()
+                    _cached_protocol.clear()
 
                     # Update current pattern file reference
                     st.session_state.current_pattern_file = filename
@@ -417,8 +1086,6 @@ def main():
 
                     st.success(text['protocol_saved'])
                     st.rerun()
-                else:
-                    st.error(text['enter_protocol_name'])
 
         st.divider()
 
@@ -429,8 +1096,10 @@ def main():
             value=st.session_state.default_data_path,
             help="Path to folder containing .asc files",
             key='data_folder_input',
-            on_change=save_user_prefs
+            on_change=mark_user_prefs_dirty
         )
+        # Re-scan the folder even if the cached listing hasn't expired yet
+        st.button(f"🔄 {text['refresh_file_list']}", key='refresh_file_list_btn', on_click=_cached_file_list.clear)
 
         # Update default_data_path from widget state
         if 'data_folder_input' in st.session_state:
@@ -439,9 +1108,12 @@ def main():
         else:
             data_folder = st.session_state.default_data_path
 
-        # Get file list (support .asc and .csv)
-        file_list = get_file_list(data_folder, '.asc,.csv')
-        file_names = [os.path.basename(f) for f in file_list]
+        # Get file list (support .asc and .csv), cached across reruns
+        try:
+            data_folder_mtime = os.path.getmtime(data_folder)
+        except OSError:
+            data_folder_mtime = None
+        file_names, file_paths = _cached_file_list(data_folder, '.asc,.csv', data_folder_mtime)
 
         # Initialize variables
         selected_file_path = None
@@ -453,13 +1125,19 @@ def main():
         # Single file mode UI
         if not is_multi_file_mode:
             # File selection
-            if len(file_names) > 0:
+            file_options = file_names
+            if len(file_names) > FILE_SELECT_MAX_OPTIONS:
+                # Keep the dropdown small for large folders
+                file_query = st.text_input(text['filter_files'], key='file_filter_input').strip().lower()
+                file_options = [n for n in file_names if file_query in n.lower()][:FILE_SELECT_MAX_OPTIONS]
+                st.caption(text['files_shown'].format(shown=len(file_options), total=len(file_names)))
+
+            if len(file_options) > 0:
                 selected_file_name = st.selectbox(
                     text['select_file'],
-                    options=file_names
+                    options=file_options
                 )
-                selected_file_idx = file_names.index(selected_file_name)
-                selected_file_path = file_list[selected_file_idx]
+                selected_file_path = file_paths[selected_file_name]
                 st.success(f"{text['file_selected']}: {selected_file_name}")
             else:
                 st.warning(text['no_file_selected'])
@@ -509,7 +1187,7 @@ def main():
             options=[10, 20, 30, 40, 50, 60, 70, 80, 90],
             default=st.session_state.default_tx,
             key='default_tx_selector',
-            on_change=save_user_prefs
+            on_change=mark_user_prefs_dirty
         )
 
         # Update session state
@@ -522,24 +1200,30 @@ def main():
             help=text['custom_tx_help']
         )
 
-        # Parse custom TX values
+        # Parse custom TX values (a bad entry doesn't discard the valid ones)
         custom_tx = []
-        if custom_tx_input.strip():
+        invalid_tx = []
+        for token in custom_tx_input.split(','):
+            token = token.strip()
+            if not token:
+                continue
             try:
-                custom_tx = [float(x.strip()) for x in custom_tx_input.split(',') if x.strip()]
+                custom_tx.append(float(token))
             except ValueError:
-                st.error("Invalid custom TX values")
+                invalid_tx.append(token)
+        if invalid_tx:
+            st.error(f"Invalid custom TX values: {', '.join(invalid_tx)}")
 
-        # Combine TX values
-        all_tx = sorted(set(default_tx + custom_tx))
+        # Combine TX values (sorted, unique, all float)
+        all_tx = sorted({float(v) for v in (*default_tx, *custom_tx)})
 
         st.divider()
 
         # Graph settings
         st.subheader(text['graph_settings'])
 
-        # Get available fonts
-        available_fonts = get_available_fonts()
+        # Get available fonts (computed once per process)
+        available_fonts = _cached_fonts()
 
         # Font selection
         font_name = st.selectbox(
@@ -547,7 +1231,7 @@ def main():
             options=available_fonts,
             index=available_fonts.index(st.session_state.font_name) if st.session_state.font_name in available_fonts else 0,
             key='font_selector',
-            on_change=save_user_prefs
+            on_change=mark_user_prefs_dirty
         )
         st.session_state.font_name = font_name
 
@@ -562,7 +1246,7 @@ def main():
                 value=st.session_state.label_fontsize,
                 step=1,
                 key='label_fontsize_input',
-                on_change=save_user_prefs
+                on_change=mark_user_prefs_dirty
             )
             st.session_state.label_fontsize = label_fontsize
 
@@ -574,7 +1258,7 @@ def main():
                 value=st.session_state.tick_fontsize,
                 step=1,
                 key='tick_fontsize_input',
-                on_change=save_user_prefs
+                on_change=mark_user_prefs_dirty
             )
             st.session_state.tick_fontsize = tick_fontsize
 
@@ -586,7 +1270,7 @@ def main():
                 value=st.session_state.legend_fontsize,
                 step=1,
                 key='legend_fontsize_input',
-                on_change=save_user_prefs
+                on_change=mark_user_prefs_dirty
             )
             st.session_state.legend_fontsize = legend_fontsize
 
@@ -614,7 +1298,13 @@ def main():
 
         # Calibration selector
         settings_mgr_cal = st.session_state.settings_manager
-        available_calibrations = settings_mgr_cal.list_calibration_files()
+        try:
+            calibration_dir_mtime = os.path.getmtime(settings_mgr_cal.calibration_dir)
+        except OSError:
+            calibration_dir_mtime = None
+        available_calibrations = _cached_calibration_files(
+            settings_mgr_cal, settings_mgr_cal.calibration_dir, calibration_dir_mtime
+        )
 
         # Initialize current calibration file if not exists
         if 'current_calibration_file' not in st.session_state:
@@ -686,7 +1376,7 @@ def main():
             step=0.01,
             format="%.4f",
             key='calibration_slope_input',
-            on_change=save_user_prefs
+            on_change=mark_user_prefs_dirty
         )
         st.session_state.calibration_slope = calibration_slope
 
@@ -698,7 +1388,7 @@ def main():
                 step=0.01,
                 format="%.4f",
                 key='calibration_intercept_input',
-                on_change=save_user_prefs
+                on_change=mark_user_prefs_dirty
             )
             st.session_state.calibration_intercept = calibration_intercept
 
@@ -715,6 +1405,7 @@ def main():
                     )
                     filename = f"{calibration_name}.json"
                     settings_mgr_cal.save_calibration(new_cal, filename)
+                    _cached_calibration_files.clear()
                     st.session_state.current_calibration_file = filename
                     st.success(text['calibration_saved_msg'])
                     st.rerun()
@@ -725,6 +1416,7 @@ def main():
             if selected_cal != '__new__' and selected_cal != 'default.json':
                 if st.button(text['delete_calibration'], key='del_cal_btn'):
                     settings_mgr_cal.delete_calibration(selected_cal)
+                    _cached_calibration_files.clear()
                     st.session_state.current_calibration_file = 'default.json'
                     loaded_cal = settings_mgr_cal.load_calibration('default.json')
                     if loaded_cal:
@@ -747,17 +1439,16 @@ def main():
             st.error(text['no_file_selected'])
             return
 
-        # Determine file path
+        # Determine data source (uploaded files are processed in memory)
         if uploaded_file is not None:
-            # Save uploaded file temporarily
-            temp_path = f"temp_{uploaded_file.name}"
-            with open(temp_path, 'wb') as f:
-                f.write(uploaded_file.getvalue())
-            file_path = temp_path
-            file_name_base = os.path.splitext(uploaded_file.name)[0]
+            file_path = uploaded_file
+            file_name = uploaded_file.name
+            file_mtime = None
         else:
             file_path = selected_file_path
-            file_name_base = os.path.splitext(os.path.basename(selected_file_path))[0]
+            file_name = os.path.basename(selected_file_path)
+            file_mtime = os.path.getmtime(file_path)
+        file_name_base = os.path.splitext(file_name)[0]
 
         # Check if semi-auto mode
         protocol = st.session_state.protocol_settings
@@ -768,30 +1459,40 @@ def main():
             try:
                 # Data processing
                 st.info(text['reading_file'])
-                processor = BenzeneDataProcessor(
-                    conversion_slope=st.session_state.calibration_slope,
-                    conversion_intercept=st.session_state.calibration_intercept,
-                    protocol_settings=st.session_state.protocol_settings,
-                    auto_intercept=not st.session_state.no_correction_mode
+                # Cache key for the file processing step
+                process_args = (
+                    file_path,
+                    file_mtime,
+                    st.session_state.calibration_slope,
+                    st.session_state.calibration_intercept,
+                    not st.session_state.no_correction_mode,
+                    protocol.to_dict()
                 )
+                processor = _cached_processor(*process_args[2:])
+
+                # New results: drop display tables built from the previous ones
+                st.session_state.arrow_tables = {}
 
                 if is_semi_auto_mode:
                     # Semi-auto mode: process for multiple reactors
-                    reactor_data, times, intensities, temp_data = processor.process_file_semi_auto(file_path)
+                    reactor_data, times, intensities, temp_data = _process_data_file(*process_args, semi_auto=True)
 
                     # Validate data
                     if len(times) == 0:
                         # Diagnostic info
-                        file_ext = os.path.splitext(file_path)[1].lower()
-                        file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+                        file_ext = os.path.splitext(file_name)[1].lower()
+                        if uploaded_file is not None:
+                            file_size = uploaded_file.size
+                        else:
+                            file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
                         try:
-                            with open(file_path, 'r', encoding='utf-8', errors='ignore') as diag_f:
+                            with open_data_source(file_path) as diag_f:
                                 first_lines = [diag_f.readline().strip() for _ in range(5)]
                             preview = '\n'.join(first_lines)
                         except Exception:
                             preview = "(読み取り不可)"
-                        st.error(f"{text['invalid_data']}: {os.path.basename(file_path)}")
-                        st.error(f"パス: {file_path}\n拡張子: {file_ext}, サイズ: {file_size} bytes\n先頭5行:\n{preview}")
+                        st.error(f"{text['invalid_data']}: {file_name}")
+                        st.error(f"パス: {file_name if uploaded_file is not None else file_path}\n拡張子: {file_ext}, サイズ: {file_size} bytes\n先頭5行:\n{preview}")
                         st.session_state.analysis_done = False
                         raise ValueError(text['invalid_data'])
 
@@ -812,8 +1513,10 @@ def main():
 
                     # Store raw data
                     st.session_state.reactor_data = reactor_data
-                    st.session_state.times = times
-                    st.session_state.intensities = intensities
+                    st.session_state.reactor_ids = sorted(reactor_data.keys())
+                    st.session_state.reactor_arrays = stack_reactor_arrays(reactor_data, st.session_state.reactor_ids)
+                    st.session_state.times = as_plot_array(times)
+                    st.session_state.intensities = as_plot_array(intensities)
                     st.session_state.temp_data = temp_data
                     st.session_state.file_name_base = file_name_base
                     st.session_state.is_semi_auto_mode = True
@@ -823,22 +1526,9 @@ def main():
                     fitting_results = {}
 
                     for reactor_id, data in reactor_data.items():
-                        fitter = SigmoidFitter()
-                        success = fitter.fit(data['temperatures'], data['conversions'])
-
+                        success, fitter = _fit_sigmoid(data['temperatures'], data['conversions'])
                         if success:
-                            fitting_params = fitter.get_fitting_params()
-                            tx_results = fitter.calculate_tx_values(all_tx)
-                            temp_fit, conv_fit = fitter.get_fitted_curve()
-
-                            fitting_results[reactor_id] = {
-                                'success': True,
-                                'fitting_params': fitting_params,
-                                'tx_results': tx_results,
-                                'temp_fit': temp_fit,
-                                'conv_fit': conv_fit,
-                                'r_squared': fitting_params['r_squared']
-                            }
+                            fitting_results[reactor_id] = {'success': True, **fitter.finalize(all_tx)}
                         else:
                             fitting_results[reactor_id] = {
                                 'success': False
@@ -849,21 +1539,24 @@ def main():
 
                 else:
                     # Standard mode
-                    temperatures, conversions, detailed_df, times, intensities, temp_data = processor.process_file(file_path)
+                    temperatures, conversions, detailed_df, times, intensities, temp_data = _process_data_file(*process_args, semi_auto=False)
 
                     # Validate data
                     if len(times) == 0:
                         # Diagnostic info
-                        file_ext = os.path.splitext(file_path)[1].lower()
-                        file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+                        file_ext = os.path.splitext(file_name)[1].lower()
+                        if uploaded_file is not None:
+                            file_size = uploaded_file.size
+                        else:
+                            file_size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
                         try:
-                            with open(file_path, 'r', encoding='utf-8', errors='ignore') as diag_f:
+                            with open_data_source(file_path) as diag_f:
                                 first_lines = [diag_f.readline().strip() for _ in range(5)]
                             preview = '\n'.join(first_lines)
                         except Exception:
                             preview = "(読み取り不可)"
-                        st.error(f"{text['invalid_data']}: {os.path.basename(file_path)}")
-                        st.error(f"パス: {file_path}\n拡張子: {file_ext}, サイズ: {file_size} bytes\n先頭5行:\n{preview}")
+                        st.error(f"{text['invalid_data']}: {file_name}")
+                        st.error(f"パス: {file_name if uploaded_file is not None else file_path}\n拡張子: {file_ext}, サイズ: {file_size} bytes\n先頭5行:\n{preview}")
                         st.session_state.analysis_done = False
                         raise ValueError(text['invalid_data'])
 
@@ -883,19 +1576,18 @@ def main():
                         st.warning(text['missing_steps'].format(detected=detected_steps, total=total_steps))
 
                     # Store raw data first (so timeseries plot can always be shown)
-                    st.session_state.temperatures = temperatures
-                    st.session_state.conversions = conversions
+                    st.session_state.temperatures = as_plot_array(temperatures)
+                    st.session_state.conversions = as_plot_array(conversions)
                     st.session_state.detailed_df = detailed_df
-                    st.session_state.times = times
-                    st.session_state.intensities = intensities
+                    st.session_state.times = as_plot_array(times)
+                    st.session_state.intensities = as_plot_array(intensities)
                     st.session_state.temp_data = temp_data
                     st.session_state.file_name_base = file_name_base
                     st.session_state.is_semi_auto_mode = False
 
                     # Fitting
                     st.info(text['fitting'])
-                    fitter = SigmoidFitter()
-                    success = fitter.fit(temperatures, conversions)
+                    success, fitter = _fit_sigmoid(temperatures, conversions)
 
                     if not success:
                         # Fitting failed, but still show timeseries data
@@ -905,386 +1597,24 @@ def main():
                     else:
                         # Calculate TX values
                         st.info(text['calculating'])
-                        fitting_params = fitter.get_fitting_params()
-                        tx_results = fitter.calculate_tx_values(all_tx)
-                        temp_fit, conv_fit = fitter.get_fitted_curve()
+                        fit_output = fitter.finalize(all_tx)
 
                         # Store fitting results in session state
                         st.session_state.analysis_done = True
                         st.session_state.fitting_success = True
-                        st.session_state.fitting_params = fitting_params
-                        st.session_state.tx_results = tx_results
-                        st.session_state.temp_fit = temp_fit
-                        st.session_state.conv_fit = conv_fit
-
-                # Clean up temp file
-                if uploaded_file is not None and os.path.exists(temp_path):
-                    os.remove(temp_path)
+                        st.session_state.fitting_params = fit_output['fitting_params']
+                        st.session_state.tx_results = fit_output['tx_results']
+                        st.session_state.temp_fit = as_plot_array(fit_output['temp_fit'])
+                        st.session_state.conv_fit = as_plot_array(fit_output['conv_fit'])
 
             except Exception as e:
                 st.error(f"{text['error']}: {str(e)}")
-                import traceback
                 st.error(traceback.format_exc())
                 return
 
     # Display results if analysis is done
     if st.session_state.analysis_done:
-        st.success(text['results_title'])
-
-        # Show protocol info
-        protocol = st.session_state.protocol_settings
-        is_semi_auto_display = getattr(protocol, 'mode', 'standard') == 'semi_auto'
-
-        with st.expander(f"📋 {text['protocol_settings']}: {protocol.name}", expanded=False):
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric(text['num_steps'], len(protocol.steps))
-            with col2:
-                st.metric(text['ramp_time'], f"{protocol.ramp_time} min")
-            with col3:
-                st.metric(text['analysis_time'], f"{protocol.analysis_time} min")
-
-            # Show step details
-            steps_data = []
-            for i, step in enumerate(protocol.steps):
-                step_info = {
-                    text['step']: f"{i+1}",
-                    f"{text['temperature']} (℃)": step.temperature,
-                    f"{text['hold_time']}": f"{step.hold_time} min"
-                }
-                if is_semi_auto_display:
-                    step_info[text['reactor']] = getattr(step, 'reactor_id', 1)
-                steps_data.append(step_info)
-            st.table(steps_data)
-
-        # Check if semi-auto mode results
-        if st.session_state.get('is_semi_auto_mode', False):
-            # Semi-auto mode: display with tabs for each reactor
-            reactor_data = st.session_state.reactor_data
-            fitting_results = st.session_state.fitting_results
-            num_reactors = len(reactor_data)
-
-            # Create tabs for each reactor + comparison tab
-            tab_names = [text['reactor_n'].format(rid) for rid in sorted(reactor_data.keys())]
-            tab_names.append(text['comparison'])
-            tabs = st.tabs(tab_names)
-
-            # Store figures for saving
-            reactor_figs = {}
-
-            # Display each reactor's results in its tab
-            for tab_idx, reactor_id in enumerate(sorted(reactor_data.keys())):
-                with tabs[tab_idx]:
-                    data = reactor_data[reactor_id]
-                    fit_result = fitting_results.get(reactor_id, {})
-
-                    if fit_result.get('success', False):
-                        # Create two columns for results
-                        col1, col2 = st.columns(2)
-
-                        with col1:
-                            # Fitting parameters
-                            st.subheader(text['fitting_results'])
-                            params = fit_result['fitting_params']
-
-                            st.metric(text['max_conv'], f"{params['a_max_conversion']:.2f} %")
-                            st.metric(text['growth_rate'], f"{params['b_growth_rate']:.4f}")
-                            st.metric(text['inflection_temp'], f"{params['c_inflection_temp']:.1f} {text['temp_unit']}")
-                            st.metric(text['min_conv'], f"{params['d_min_conversion']:.2f} %")
-                            st.metric(text['r_squared'], f"{params['r_squared']:.4f}")
-
-                        with col2:
-                            # TX results
-                            st.subheader(text['tx_results'])
-                            tx_data = []
-                            for key, value in sorted(fit_result['tx_results'].items()):
-                                if value is not None:
-                                    tx_data.append({
-                                        'TX': key,
-                                        f"{text['temperature']} ({text['temp_unit']})": f"{value:.1f}"
-                                    })
-                                else:
-                                    tx_data.append({
-                                        'TX': key,
-                                        f"{text['temperature']} ({text['temp_unit']})": text['cannot_calc']
-                                    })
-                            st.table(tx_data)
-
-                        st.divider()
-
-                        # Activity plot with fitting
-                        st.subheader(text['graph_title'])
-                        fig = create_activity_plot(
-                            data['temperatures'],
-                            data['conversions'],
-                            fit_result['temp_fit'],
-                            fit_result['conv_fit'],
-                            fit_result['tx_results'],
-                            fit_result['r_squared'],
-                            language=st.session_state.language,
-                            font_name=st.session_state.font_name,
-                            label_fontsize=st.session_state.label_fontsize,
-                            tick_fontsize=st.session_state.tick_fontsize,
-                            legend_fontsize=st.session_state.legend_fontsize
-                        )
-                        reactor_figs[reactor_id] = fig
-                        st.pyplot(fig)
-
-                    else:
-                        st.warning(text['fitting_error'])
-
-                        # Simple plot without fitting
-                        st.subheader(text['graph_title'])
-                        fig = create_simple_activity_plot(
-                            data['temperatures'],
-                            data['conversions'],
-                            language=st.session_state.language,
-                            font_name=st.session_state.font_name,
-                            label_fontsize=st.session_state.label_fontsize,
-                            tick_fontsize=st.session_state.tick_fontsize,
-                            legend_fontsize=st.session_state.legend_fontsize
-                        )
-                        reactor_figs[reactor_id] = fig
-                        st.pyplot(fig)
-
-                    # Temperature data table
-                    st.subheader(text['temp_data_title'])
-                    display_df = data['detailed_df'].copy()
-                    display_df.columns = [
-                        f"{text['temperature']} ({text['temp_unit']})",
-                        text['intensity_avg'],
-                        f"{text['conversion']} (%)",
-                        text['data_points']
-                    ]
-                    st.dataframe(display_df, use_container_width=True)
-
-            # Comparison tab
-            with tabs[-1]:
-                # Time-series plot with reactor colors
-                st.subheader(text['timeseries_title'])
-                st.caption(text['timeseries_desc'])
-
-                timeseries_fig = create_timeseries_plot(
-                    st.session_state.times,
-                    st.session_state.intensities,
-                    st.session_state.temp_data,
-                    language=st.session_state.language,
-                    font_name=st.session_state.font_name,
-                    label_fontsize=st.session_state.label_fontsize,
-                    tick_fontsize=st.session_state.tick_fontsize,
-                    semi_auto_mode=True,
-                    num_reactors=num_reactors
-                )
-                st.pyplot(timeseries_fig)
-
-                st.divider()
-
-                # Comparison plot
-                st.subheader(text['graph_title'])
-                comparison_fig = create_comparison_plot(
-                    reactor_data,
-                    fitting_results,
-                    language=st.session_state.language,
-                    font_name=st.session_state.font_name,
-                    label_fontsize=st.session_state.label_fontsize,
-                    tick_fontsize=st.session_state.tick_fontsize,
-                    legend_fontsize=st.session_state.legend_fontsize
-                )
-                st.pyplot(comparison_fig)
-
-                st.divider()
-
-                # TX comparison table
-                st.subheader(text['comparison_table'])
-                comparison_data = []
-                for reactor_id in sorted(reactor_data.keys()):
-                    fit_result = fitting_results.get(reactor_id, {})
-                    row = {text['reactor']: reactor_id}
-                    if fit_result.get('success', False):
-                        for key, value in sorted(fit_result['tx_results'].items()):
-                            row[key] = f"{value:.1f}" if value is not None else "-"
-                    else:
-                        row['Status'] = text['fitting_error']
-                    comparison_data.append(row)
-                st.table(comparison_data)
-
-            # Store the main figure for saving (comparison plot)
-            fig = comparison_fig
-
-        else:
-            # Standard mode display (original code)
-            # Only show fitting results if fitting succeeded
-            if st.session_state.get('fitting_success', False):
-                # Create two columns for results
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    # Fitting parameters
-                    st.subheader(text['fitting_results'])
-                    params = st.session_state.fitting_params
-
-                    st.metric(
-                        text['max_conv'],
-                        f"{params['a_max_conversion']:.2f} %"
-                    )
-                    st.metric(
-                        text['growth_rate'],
-                        f"{params['b_growth_rate']:.4f}"
-                    )
-                    st.metric(
-                        text['inflection_temp'],
-                        f"{params['c_inflection_temp']:.1f} {text['temp_unit']}"
-                    )
-                    st.metric(
-                        text['min_conv'],
-                        f"{params['d_min_conversion']:.2f} %"
-                    )
-                    st.metric(
-                        text['r_squared'],
-                        f"{params['r_squared']:.4f}"
-                    )
-
-                with col2:
-                    # TX results
-                    st.subheader(text['tx_results'])
-                    tx_data = []
-                    for key, value in sorted(st.session_state.tx_results.items()):
-                        if value is not None:
-                            tx_data.append({
-                                'TX': key,
-                                f"{text['temperature']} ({text['temp_unit']})": f"{value:.1f}"
-                            })
-                        else:
-                            tx_data.append({
-                                'TX': key,
-                                f"{text['temperature']} ({text['temp_unit']})": text['cannot_calc']
-                            })
-
-                    st.table(tx_data)
-
-                st.divider()
-
-            # Time-series plot
-            st.subheader(text['timeseries_title'])
-            st.caption(text['timeseries_desc'])
-
-            # Create time-series plot
-            timeseries_fig = create_timeseries_plot(
-                st.session_state.times,
-                st.session_state.intensities,
-                st.session_state.temp_data,
-                language=st.session_state.language,
-                font_name=st.session_state.font_name,
-                label_fontsize=st.session_state.label_fontsize,
-                tick_fontsize=st.session_state.tick_fontsize
-            )
-
-            # Display time-series plot
-            st.pyplot(timeseries_fig)
-
-            # Temperature data table
-            st.subheader(text['temp_data_title'])
-            display_df = st.session_state.detailed_df.copy()
-            display_df.columns = [
-                f"{text['temperature']} ({text['temp_unit']})",
-                text['intensity_avg'],
-                f"{text['conversion']} (%)",
-                text['data_points']
-            ]
-            st.dataframe(display_df, use_container_width=True)
-
-            # Activity plot - show regardless of fitting success
-            st.divider()
-
-            # Graph
-            st.subheader(text['graph_title'])
-
-            # Create plot based on fitting success
-            if st.session_state.get('fitting_success', False):
-                # Create plot with fitting curve
-                fig = create_activity_plot(
-                    st.session_state.temperatures,
-                    st.session_state.conversions,
-                    st.session_state.temp_fit,
-                    st.session_state.conv_fit,
-                    st.session_state.tx_results,
-                    st.session_state.fitting_params['r_squared'],
-                    language=st.session_state.language,
-                    font_name=st.session_state.font_name,
-                    label_fontsize=st.session_state.label_fontsize,
-                    tick_fontsize=st.session_state.tick_fontsize,
-                    legend_fontsize=st.session_state.legend_fontsize
-                )
-            else:
-                # Create simple plot with experimental data only
-                fig = create_simple_activity_plot(
-                    st.session_state.temperatures,
-                    st.session_state.conversions,
-                    language=st.session_state.language,
-                    font_name=st.session_state.font_name,
-                    label_fontsize=st.session_state.label_fontsize,
-                    tick_fontsize=st.session_state.tick_fontsize,
-                    legend_fontsize=st.session_state.legend_fontsize
-                )
-
-            # Display plot
-            st.pyplot(fig)
-
-        st.divider()
-
-        # Save graph section
-        st.subheader(text['save_graph'])
-
-        # Create columns for save settings
-        save_col1, save_col2 = st.columns(2)
-
-        with save_col1:
-            # Save folder path setting (same style as data folder)
-            st.text_input(
-                text['save_folder_custom'],
-                value=st.session_state.default_save_path,
-                help="Path to save graphs",
-                key='save_folder_input',
-                on_change=save_user_prefs
-            )
-
-            # Update default_save_path from widget state
-            if 'save_folder_input' in st.session_state:
-                st.session_state.default_save_path = st.session_state.save_folder_input
-                save_directory = st.session_state.save_folder_input
-            else:
-                save_directory = st.session_state.default_save_path
-
-        with save_col2:
-            # File name
-            save_filename = st.text_input(
-                "File name (without extension) / ファイル名（拡張子なし）",
-                value=st.session_state.file_name_base
-            )
-
-            # DPI setting
-            dpi_value = st.number_input(
-                "DPI (解像度)",
-                min_value=150,
-                max_value=1200,
-                value=600,
-                step=50,
-                help="Higher DPI = Higher quality (default: 600)"
-            )
-
-        # Save button
-        if st.button(text['save_graph'], type="primary"):
-            try:
-                # Create full file path
-                full_path = os.path.join(save_directory, f"{save_filename}.png")
-
-                # Save plot with specified DPI
-                save_plot(fig, full_path, dpi=dpi_value)
-
-                st.success(f"{text['graph_saved']}: {full_path}")
-
-            except Exception as e:
-                st.error(f"{text['error']}: {str(e)}")
+        render_results(text)
 
     # Multi-file comparison mode
     if run_multi_comparison:
@@ -1293,63 +1623,37 @@ def main():
         else:
             with st.spinner(text['processing']):
                 try:
-                    # Process each file
-                    multi_sample_data = []
-                    multi_file_detailed_results = {}
-
-                    for fname in selected_files_for_comparison:
-                        # Get full path
-                        file_idx = file_names.index(fname)
-                        fpath = file_list[file_idx]
+                    # Process each file (files are independent, so run them in parallel;
+                    # session state is read here since worker threads have no script context)
+                    slope = st.session_state.calibration_slope
+                    intercept = st.session_state.calibration_intercept
+                    auto_intercept = not st.session_state.no_correction_mode
+                    protocol_dict = st.session_state.protocol_settings.to_dict()
+
+                    def _process_one(fname):
+                        fpath = file_paths[fname]
                         sample_name = multi_file_sample_names.get(fname, fname)
+                        return process_sample_file(fpath, sample_name, slope, intercept,
+                                                   auto_intercept, protocol_dict, all_tx)
 
-                        # Create processor (with auto_intercept per file)
-                        processor = BenzeneDataProcessor(
-                            conversion_slope=st.session_state.calibration_slope,
-                            conversion_intercept=st.session_state.calibration_intercept,
-                            protocol_settings=st.session_state.protocol_settings,
-                            auto_intercept=not st.session_state.no_correction_mode
-                        )
-
-                        # Process file
-                        temperatures, conversions, detailed_df, times, intensities, temp_data = processor.process_file(fpath)
+                    script_ctx = get_script_run_ctx()
+                    max_workers = max(1, min(8, len(selected_files_for_comparison)))
+                    with ThreadPoolExecutor(
+                        max_workers=max_workers,
+                        initializer=lambda: add_script_run_ctx(threading.current_thread(), script_ctx)
+                    ) as executor:
+                        multi_sample_data = list(executor.map(_process_one, selected_files_for_comparison))
 
-                        # Fit sigmoid
-                        fitter = SigmoidFitter()
-                        success = fitter.fit(temperatures, conversions)
-
-                        sample_entry = {
-                            'name': sample_name,
-                            'temperatures': temperatures,
-                            'conversions': conversions,
-                            'detailed_df': detailed_df
-                        }
-
-                        if success:
-                            fitting_params = fitter.get_fitting_params()
-                            tx_results = fitter.calculate_tx_values(all_tx)
-                            temp_fit, conv_fit = fitter.get_fitted_curve()
-
-                            sample_entry['temp_fit'] = temp_fit
-                            sample_entry['conv_fit'] = conv_fit
-                            sample_entry['r_squared'] = fitting_params['r_squared']
-                            sample_entry['fitting_params'] = fitting_params
-                            sample_entry['tx_results'] = tx_results
-                            sample_entry['fitting_success'] = True
-                        else:
-                            sample_entry['fitting_success'] = False
-
-                        multi_sample_data.append(sample_entry)
-                        multi_file_detailed_results[sample_name] = sample_entry
+                    multi_file_detailed_results = {sample['name']: sample for sample in multi_sample_data}
 
                     # Store results in session state
+                    st.session_state.arrow_tables = {}
                     st.session_state.multi_sample_data = multi_sample_data
                     st.session_state.multi_file_detailed_results = multi_file_detailed_results
                     st.session_state.multi_file_comparison_done = True
 
                 except Exception as e:
                     st.error(f"{text['error']}: {str(e)}")
-                    import traceback
                     st.error(traceback.format_exc())
 
     # Display multi-file comparison results
@@ -1361,7 +1665,8 @@ def main():
         multi_file_detailed_results = st.session_state.multi_file_detailed_results
 
         # Create comparison plot
-        multi_fig = create_multi_file_comparison_plot(
+        multi_fig = _cached_figure(
+            'create_multi_file_comparison_plot',
             multi_sample_data,
             language=st.session_state.language,
             font_name=st.session_state.font_name,
@@ -1376,22 +1681,20 @@ def main():
 
         # TX comparison table
         st.subheader(text['comparison_table'])
-        comparison_rows = []
-        for sample in multi_sample_data:
-            row = {text['sample_name']: sample['name']}
-            if sample.get('fitting_success', False):
-                for key, value in sorted(sample['tx_results'].items()):
-                    row[key] = f"{value:.1f}" if value is not None else "-"
-                row['R²'] = f"{sample['r_squared']:.4f}"
-            else:
-                row['Status'] = text['fitting_error']
-            comparison_rows.append(row)
-        st.table(comparison_rows)
+        fitted = [sample.get('fitting_success', False) for sample in multi_sample_data]
+        comparison_df = build_tx_table(
+            text['sample_name'],
+            [sample['name'] for sample in multi_sample_data],
+            [sample['tx_results'] if ok else None for sample, ok in zip(multi_sample_data, fitted)],
+            text['fitting_error'],
+            r_squared=[sample['r_squared'] if ok else None for sample, ok in zip(multi_sample_data, fitted)]
+        )
+        st.table(comparison_df)
 
         st.divider()
 
         # Individual sample details in expanders
-        for sample in multi_sample_data:
+        for sample_idx, sample in enumerate(multi_sample_data):
             with st.expander(f"📊 {sample['name']}", expanded=False):
                 if sample.get('fitting_success', False):
                     col1, col2 = st.columns(2)
@@ -1407,67 +1710,45 @@ def main():
 
                     with col2:
                         st.subheader(text['tx_results'])
-                        tx_data = []
-                        for key, value in sorted(sample['tx_results'].items()):
-                            if value is not None:
-                                tx_data.append({
-                                    'TX': key,
-                                    f"{text['temperature']} ({text['temp_unit']})": f"{value:.1f}"
-                                })
-                            else:
-                                tx_data.append({
-                                    'TX': key,
-                                    f"{text['temperature']} ({text['temp_unit']})": text['cannot_calc']
-                                })
-                        st.table(tx_data)
+                        st.table(tx_results_table(sample['tx_results'], text))
                 else:
                     st.warning(text['fitting_error'])
 
                 # Data table
                 st.subheader(text['temp_data_title'])
-                display_df = sample['detailed_df'].copy()
-                display_df.columns = [
-                    f"{text['temperature']} ({text['temp_unit']})",
-                    text['intensity_avg'],
-                    f"{text['conversion']} (%)",
-                    text['data_points']
-                ]
-                st.dataframe(display_df, use_container_width=True)
+                display_table = detailed_display_table(('sample', sample_idx), sample['detailed_df'], text)
+                st.dataframe(display_table, use_container_width=True)
 
         st.divider()
 
         # Save multi-file comparison graph
         st.subheader(text['save_graph'])
 
-        save_col1, save_col2 = st.columns(2)
+        multi_dpi_value = select_save_dpi('multi')
 
-        with save_col1:
-            multi_save_directory = st.text_input(
-                text['save_folder_custom'],
-                value=st.session_state.default_save_path,
-                key='multi_save_folder_input'
-            )
+        with st.form('multi_save_form', clear_on_submit=False, border=False):
+            save_col1, save_col2 = st.columns(2)
 
-        with save_col2:
-            multi_save_filename = st.text_input(
-                "File name / ファイル名",
-                value="multi_comparison",
-                key='multi_save_filename'
-            )
+            with save_col1:
+                multi_save_directory = st.text_input(
+                    text['save_folder_custom'],
+                    value=st.session_state.default_save_path,
+                    key='multi_save_folder_input'
+                )
 
-            multi_dpi_value = st.number_input(
-                "DPI",
-                min_value=150,
-                max_value=1200,
-                value=600,
-                step=50,
-                key='multi_dpi_input'
-            )
+            with save_col2:
+                multi_save_filename = st.text_input(
+                    "File name / ファイル名",
+                    value="multi_comparison",
+                    key='multi_save_filename'
+                )
+
+            multi_save_clicked = st.form_submit_button(text['save_graph'], type="primary")
 
-        if st.button(text['save_graph'], type="primary", key='save_multi_graph_btn'):
+        if multi_save_clicked:
             try:
                 full_path = os.path.join(multi_save_directory, f"{multi_save_filename}.png")
-                save_plot(multi_fig, full_path, dpi=multi_dpi_value)
+                visualization.save_plot(multi_fig, full_path, dpi=multi_dpi_value)
                 st.success(f"{text['graph_saved']}: {full_path}")
             except Exception as e:
                 st.error(f"{text['error']}: {str(e)}")
@@ -1,9 +1,44 @@
 """
 Data processing module for benzene oxidation activity analysis
 """
+import io
+import os
 import numpy as np
 import pandas as pd
-from typing import Tuple, Dict, List, Optional
+from typing import Tuple, Dict, List, Optional, Union, IO
+
+# A data file path or a file-like object (e.g. Streamlit UploadedFile)
+DataSource = Union[str, os.PathLike, IO]
+
+# Read buffer for data files (FT-IR traces are often several MB)
+READ_BUFFER_SIZE = 1024 * 1024
+
+
+def open_data_source(source: DataSource) -> IO[str]:
+    """
+    Open a data source for line-by-line text reading
+
+    Args:
+        source: File path or file-like object (text or binary)
+
+    Returns:
+        Text file object (use as a context manager)
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'r', encoding='utf-8', errors='ignore', buffering=READ_BUFFER_SIZE)
+
+    # BytesIO-style buffer (e.g. Streamlit UploadedFile): decode straight from
+    # its memory instead of copying the contents to a bytes object first
+    if hasattr(source, 'getbuffer'):
+        return io.StringIO(str(source.getbuffer(), 'utf-8', 'ignore'))
+
+    # Other buffers: read from the start and rewind so the source can be reused
+    source.seek(0)
+    data = source.read()
+    source.seek(0)
+    if isinstance(data, bytes):
+        data = data.decode('utf-8', errors='ignore')
+    return io.StringIO(data)
 
 
 class BenzeneDataProcessor:
@@ -53,76 +88,84 @@ class BenzeneDataProcessor:
         self.mode = getattr(protocol_settings, 'mode', 'standard')
         self.num_reactors = getattr(protocol_settings, 'num_reactors', 1)
 
+    def _hold_schedule(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Start offset and length of every hold period, relative to the first data point
+
+        Moving to the next step takes ramp_time, except between steps at the same
+        temperature (different reactors), which follow each other directly.
+
+        Returns:
+            Tuple of (hold_offsets, hold_times) in seconds, one entry per step
+        """
+        temps = np.asarray(self.temp_steps)
+        holds = np.asarray(self.hold_times)
+        ramps = np.where(temps[1:] == temps[:-1], 0, self.ramp_time)
+        offsets = np.zeros(holds.shape, dtype=np.result_type(holds, ramps))
+        offsets[1:] = np.cumsum(holds[:-1] + ramps)
+        return offsets, holds
+
     def get_expected_duration(self) -> float:
         """Calculate expected total duration of the protocol in seconds"""
-        total = 0
-        for i, hold_time in enumerate(self.hold_times):
-            total += hold_time
-            if i + 1 < len(self.temp_steps):
-                next_temp = self.temp_steps[i + 1]
-                if self.temp_steps[i] != next_temp:
-                    total += self.ramp_time
-        return total
-
-    def read_file(self, filepath: str) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(self.hold_times):
+            return 0
+        offsets, holds = self._hold_schedule()
+        return (offsets[-1] + holds[-1]).item()
+
+    def read_file(self, filepath: DataSource) -> Tuple[np.ndarray, np.ndarray]:
         """
         Read data file (auto-detect format from extension: .asc or .csv)
 
         Args:
-            filepath: Path to data file (.asc or .csv)
+            filepath: Path to data file (.asc or .csv), or a file-like object with a name
 
         Returns:
             Tuple of (times, intensities) as numpy arrays
         """
-        if filepath.lower().endswith('.csv'):
+        name = filepath if isinstance(filepath, (str, os.PathLike)) else getattr(filepath, 'name', '')
+        if os.fspath(name).lower().endswith('.csv'):
             return self.read_csv_file(filepath)
         else:
             return self.read_asc_file(filepath)
 
-    def read_asc_file(self, filepath: str) -> Tuple[np.ndarray, np.ndarray]:
+    def read_asc_file(self, filepath: DataSource) -> Tuple[np.ndarray, np.ndarray]:
         """
         Read .asc file from FT-IR measurement
 
         Args:
-            filepath: Path to .asc file
+            filepath: Path to .asc file, or a file-like object
 
         Returns:
             Tuple of (times, intensities) as numpy arrays
         """
-        times = []
-        intensities = []
-        data_section = False
-
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        with open_data_source(filepath) as f:
+            # Skip the header up to the data section marker
             for line in f:
-                line = line.strip()
-
-                # Check if we're in the data section
-                if line == '#DATA':
-                    data_section = True
-                    continue
-
-                # Parse data lines
-                if data_section and line:
-                    parts = line.split('\t')
-                    if len(parts) >= 2:
-                        try:
-                            time = float(parts[0])
-                            intensity = float(parts[1])
-                            times.append(time)
-                            intensities.append(intensity)
-                        except ValueError:
-                            continue
-
-        return np.array(times), np.array(intensities)
-
-    def read_csv_file(self, filepath: str) -> Tuple[np.ndarray, np.ndarray]:
+                if line.strip() == '#DATA':
+                    break
+            else:
+                return np.array([]), np.array([])
+
+            # Parse the data section with pandas' C parser; lines that don't
+            # hold two numbers become NaN and are dropped below
+            try:
+                data = pd.read_csv(f, sep='\t', header=None, names=[0, 1], usecols=[0, 1],
+                                   engine='c', on_bad_lines='skip')
+            except (pd.errors.EmptyDataError, pd.errors.ParserError):
+                # Empty data section, or no line with a tab-separated second column
+                # (e.g. space-delimited or single-column data): no valid points
+                return np.array([]), np.array([])
+
+        data = data.apply(pd.to_numeric, errors='coerce').dropna()
+        return data[0].to_numpy(dtype=np.float64), data[1].to_numpy(dtype=np.float64)
+
+    def read_csv_file(self, filepath: DataSource) -> Tuple[np.ndarray, np.ndarray]:
         """
         Read CSV file from FT-IR measurement
         Format: header rows, then "Time (secs)","Abs" columns
 
         Args:
-            filepath: Path to .csv file
+            filepath: Path to .csv file, or a file-like object
 
         Returns:
             Tuple of (times, intensities) as numpy arrays
@@ -131,7 +174,7 @@ class BenzeneDataProcessor:
         intensities = []
         data_section = False
 
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        with open_data_source(filepath) as f:
             for line in f:
                 line = line.strip()
                 if not line:
@@ -159,92 +202,112 @@ class BenzeneDataProcessor:
 
         return np.array(times), np.array(intensities)
 
-    def detect_temperature_steps(self, times: np.ndarray, intensities: np.ndarray) -> Dict:
+    def detect_temperature_steps(self, times: np.ndarray, intensities: np.ndarray,
+                                 include_raw: bool = False) -> Dict:
         """
         Detect temperature steps based on measurement protocol
 
         Args:
             times: Time data in seconds
             intensities: Intensity data
+            include_raw: Also store each step's raw 'times' and 'intensities' slices
 
         Returns:
             Dictionary with step index as key and data dict as value
             Each data dict contains: 'temperature', 'reactor_id', 'time_start', 'time_end',
-            'times', 'intensities', 'avg_intensity', 'data_points'
+            'avg_intensity', 'data_points' (plus 'times', 'intensities' with include_raw)
+        """
+        return self._detect_steps(times, intensities, include_raw)[0]
+
+    def _detect_steps(self, times: np.ndarray, intensities: np.ndarray,
+                      include_raw: bool = False) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """
+        Detect temperature steps and also return the per-step summary as arrays
+
+        Returns:
+            Tuple of (temp_data, step_arrays)
+            - temp_data: Same as detect_temperature_steps
+            - step_arrays: Dict of arrays 'temperature', 'reactor_id', 'avg_intensity'
+              and 'data_points', one entry per step with data (in step order)
         """
         temp_data = {}
         if len(times) == 0:
-            return temp_data
-        start_time = times[0]
-        cumulative_time = 0
+            empty = np.empty(0)
+            return temp_data, {'temperature': empty, 'reactor_id': np.empty(0, dtype=np.int64),
+                               'avg_intensity': empty, 'data_points': np.empty(0, dtype=np.int64)}
+        # Analysis window (start, end) of each step: only the last analysis_time of
+        # each hold period is used (to allow gas equilibration), or the full hold
+        # period if it is shorter than analysis_time
+        offsets, holds = self._hold_schedule()
+        hold_starts = times[0] + offsets
+        step_starts = hold_starts + (holds - np.minimum(self.analysis_time, holds))
+        step_ends = hold_starts + holds
+
+        # Data points inside each window: times is recorded in increasing order,
+        # so each window is a contiguous slice found by binary search
+        if not np.all(times[1:] >= times[:-1]):
+            order = np.argsort(times, kind='stable')
+            times = times[order]
+            intensities = intensities[order]
+        los = np.searchsorted(times, step_starts, side='left')
+        his = np.searchsorted(times, step_ends, side='right')
+        counts = his - los
+
+        # Window sums in one pass: reduceat over interleaved (lo, hi) boundaries
+        # sums each [lo, hi) at the even positions (padded so hi == len is valid)
+        padded = np.append(intensities, 0.0) if his.size and his.max() >= len(intensities) else intensities
+        bounds = np.column_stack((los, his)).ravel()
+        sums = np.add.reduceat(padded, bounds)[::2] if bounds.size else np.empty(0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avgs = sums / counts
 
         for i, temp in enumerate(self.temp_steps):
-            hold_time = self.hold_times[i]
             reactor_id = self.reactor_ids[i] if hasattr(self, 'reactor_ids') else 1
 
-            # Calculate time window for this temperature
-            # Use only the last analysis_time minutes of hold period (to allow gas equilibration)
-            hold_start = start_time + cumulative_time
-            analysis_window = min(self.analysis_time, hold_time)  # Use full hold_time if shorter than analysis_time
-            step_start = hold_start + (hold_time - analysis_window)  # Start of analysis window
-            step_end = hold_start + hold_time  # End of hold period
-
-            # Extract data points within this time window
-            mask = (times >= step_start) & (times <= step_end)
-            step_times = times[mask]
-            step_intensities = intensities[mask]
-
-            if len(step_intensities) > 0:
-                avg_intensity = np.mean(step_intensities)
-
+            if counts[i] > 0:
                 # Use step index as key to support multiple steps at same temperature
                 temp_data[i] = {
                     'temperature': temp,
                     'reactor_id': reactor_id,
-                    'time_start': step_start,
-                    'time_end': step_end,
-                    'times': step_times,
-                    'intensities': step_intensities,
-                    'avg_intensity': avg_intensity,
-                    'data_points': len(step_intensities)
+                    'time_start': step_starts[i],
+                    'time_end': step_ends[i],
+                    'avg_intensity': avgs[i],
+                    'data_points': int(counts[i])
                 }
-
-            # Update cumulative time for next step
-            # Determine ramp time: if next step has same temperature, no ramp time needed
-            if i + 1 < len(self.temp_steps):
-                next_temp = self.temp_steps[i + 1]
-                if temp == next_temp:
-                    # Same temperature, different reactor - no ramp time
-                    ramp_for_this_step = 0
-                else:
-                    # Different temperature - use normal ramp time
-                    ramp_for_this_step = self.ramp_time
-            else:
-                # Last step - no next step
-                ramp_for_this_step = 0
-
-            cumulative_time += hold_time + ramp_for_this_step
-
-        return temp_data
-
-    def intensity_to_conversion(self, intensity: float) -> float:
+                # Raw slices are views, but pickling (e.g. for st.cache_data) copies them
+                if include_raw:
+                    temp_data[i]['times'] = times[los[i]:his[i]]
+                    temp_data[i]['intensities'] = intensities[los[i]:his[i]]
+
+        has_data = counts > 0
+        reactor_ids = self.reactor_ids if hasattr(self, 'reactor_ids') else [1] * len(self.temp_steps)
+        step_arrays = {
+            'temperature': np.asarray(self.temp_steps)[has_data],
+            'reactor_id': np.asarray(reactor_ids, dtype=np.int64)[has_data],
+            'avg_intensity': avgs[has_data],
+            'data_points': counts[has_data]
+        }
+
+        return temp_data, step_arrays
+
+    def intensity_to_conversion(self, intensity: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Convert intensity to conversion rate
 
         Args:
-            intensity: Benzene intensity from FT-IR
+            intensity: Benzene intensity from FT-IR (scalar or array)
 
         Returns:
-            Conversion rate in %
+            Conversion rate in % (same shape as intensity)
         """
         return self.conversion_slope * intensity + self.conversion_intercept
 
-    def process_file(self, filepath: str) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame, np.ndarray, np.ndarray, Dict]:
+    def process_file(self, filepath: DataSource) -> Tuple[np.ndarray, np.ndarray, pd.DataFrame, np.ndarray, np.ndarray, Dict]:
         """
         Complete processing pipeline for a data file (standard mode)
 
         Args:
-            filepath: Path to .asc file
+            filepath: Path to data file, or a file-like object
 
         Returns:
             Tuple of (temperatures, conversions, detailed_df, times, intensities, temp_data)
@@ -259,51 +322,38 @@ class BenzeneDataProcessor:
         times, intensities = self.read_file(filepath)
 
         # Detect temperature steps
-        temp_data = self.detect_temperature_steps(times, intensities)
-
-        # Extract temperatures and average intensities first
-        temperatures = []
-        avg_intensities = []
-        data_points_list = []
-
-        for step_idx in sorted(temp_data.keys()):
-            step_data = temp_data[step_idx]
-            temperatures.append(step_data['temperature'])
-            avg_intensity = step_data['avg_intensity']
-            avg_intensities.append(avg_intensity)
-            data_points_list.append(step_data['data_points'])
+        temp_data, steps = self._detect_steps(times, intensities)
+        temperatures = steps['temperature']
+        avg_intensities = steps['avg_intensity']
 
         # Auto-calculate intercept if enabled
-        if self.auto_intercept and avg_intensities:
+        if self.auto_intercept and avg_intensities.size:
             # Find max intensity (corresponds to 0% conversion - no benzene oxidized)
-            max_intensity = max(avg_intensities)
+            max_intensity = avg_intensities.max()
             # Calculate intercept so that max_intensity gives 0% conversion
             # 0 = slope * max_intensity + intercept
             # intercept = -slope * max_intensity
             self.conversion_intercept = -self.conversion_slope * max_intensity
 
         # Calculate conversions with (possibly updated) intercept
-        conversions = []
-        for avg_intensity in avg_intensities:
-            conversion = self.intensity_to_conversion(avg_intensity)
-            conversions.append(conversion)
+        conversions = self.intensity_to_conversion(avg_intensities)
 
         # Create detailed DataFrame
         detailed_df = pd.DataFrame({
             'Temperature_C': temperatures,
             'Avg_Intensity': avg_intensities,
             'Conversion_%': conversions,
-            'Data_Points': data_points_list
+            'Data_Points': steps['data_points']
         })
 
-        return np.array(temperatures), np.array(conversions), detailed_df, times, intensities, temp_data
+        return temperatures, conversions, detailed_df, times, intensities, temp_data
 
-    def process_file_semi_auto(self, filepath: str) -> Tuple[Dict[int, Dict], np.ndarray, np.ndarray, Dict]:
+    def process_file_semi_auto(self, filepath: DataSource) -> Tuple[Dict[int, Dict], np.ndarray, np.ndarray, Dict]:
         """
         Complete processing pipeline for semi-auto mode (multiple reactors)
 
         Args:
-            filepath: Path to .asc file
+            filepath: Path to data file, or a file-like object
 
         Returns:
             Tuple of (reactor_data, times, intensities, temp_data)
@@ -320,62 +370,37 @@ class BenzeneDataProcessor:
         times, intensities = self.read_file(filepath)
 
         # Detect temperature steps
-        temp_data = self.detect_temperature_steps(times, intensities)
+        temp_data, steps = self._detect_steps(times, intensities)
 
-        # Group data by reactor (first pass - collect intensities)
+        # Split the step arrays by reactor (in order of first appearance)
         reactor_data = {}
-
-        for step_idx in sorted(temp_data.keys()):
-            step = temp_data[step_idx]
-            reactor_id = step['reactor_id']
-
-            if reactor_id not in reactor_data:
-                reactor_data[reactor_id] = {
-                    'temperatures': [],
-                    'avg_intensities': [],
-                    'data_points_list': []
-                }
-
-            reactor_data[reactor_id]['temperatures'].append(step['temperature'])
-            avg_intensity = step['avg_intensity']
-            reactor_data[reactor_id]['avg_intensities'].append(avg_intensity)
-            reactor_data[reactor_id]['data_points_list'].append(step['data_points'])
-
-        # Calculate conversions for each reactor
-        for reactor_id in reactor_data:
-            data = reactor_data[reactor_id]
+        for reactor_id in dict.fromkeys(steps['reactor_id'].tolist()):
+            mask = steps['reactor_id'] == reactor_id
+            avg_intensities = steps['avg_intensity'][mask]
 
             # Auto-calculate intercept if enabled (per reactor)
-            if self.auto_intercept and data['avg_intensities']:
+            if self.auto_intercept and avg_intensities.size:
                 # Find max intensity for this reactor (corresponds to 0% conversion)
-                max_intensity = max(data['avg_intensities'])
+                max_intensity = avg_intensities.max()
                 # Calculate intercept so that max_intensity gives 0% conversion
                 intercept = -self.conversion_slope * max_intensity
             else:
                 intercept = self.conversion_intercept
 
             # Calculate conversions with appropriate intercept
-            conversions = []
-            for avg_intensity in data['avg_intensities']:
-                conversion = self.conversion_slope * avg_intensity + intercept
-                conversions.append(conversion)
-
-            data['conversions'] = conversions
-
-        # Convert lists to arrays and create DataFrames
-        for reactor_id in reactor_data:
-            data = reactor_data[reactor_id]
-            data['temperatures'] = np.array(data['temperatures'])
-            data['conversions'] = np.array(data['conversions'])
-            data['detailed_df'] = pd.DataFrame({
-                'Temperature_C': data['temperatures'],
-                'Avg_Intensity': data['avg_intensities'],
-                'Conversion_%': data['conversions'],
-                'Data_Points': data['data_points_list']
-            })
-            # Clean up temporary lists
-            del data['avg_intensities']
-            del data['data_points_list']
+            conversions = self.conversion_slope * avg_intensities + intercept
+
+            temperatures = steps['temperature'][mask]
+            reactor_data[reactor_id] = {
+                'temperatures': temperatures,
+                'conversions': conversions,
+                'detailed_df': pd.DataFrame({
+                    'Temperature_C': temperatures,
+                    'Avg_Intensity': avg_intensities,
+                    'Conversion_%': conversions,
+                    'Data_Points': steps['data_points'][mask]
+                })
+            }
 
         return reactor_data, times, intensities, temp_data
 
@@ -392,17 +417,16 @@ def get_file_list(folder_path: str, extensions: str = '.asc') -> List[str]:
     Returns:
         List of file paths
     """
-    import os
-
     if not os.path.exists(folder_path):
         return []
 
     # Support multiple extensions
     ext_list = [e.strip().lower() for e in extensions.split(',')]
 
-    files = []
-    for file in os.listdir(folder_path):
-        if any(file.lower().endswith(ext) for ext in ext_list):
-            files.append(os.path.join(folder_path, file))
+    # scandir yields the names and file types without an extra stat per entry
+    ext_tuple = tuple(ext_list)
+    with os.scandir(folder_path) as entries:
+        files = [entry.path for entry in entries
+                 if entry.name.lower().endswith(ext_tuple) and entry.is_file()]
 
     return sorted(files)
@@ -1,10 +1,14 @@
 """
 Sigmoid fitting module for benzene oxidation activity analysis
 """
+import logging
 import numpy as np
 from scipy.optimize import curve_fit
+from scipy.special import expit
 from typing import Tuple, Dict, Optional
 
+logger = logging.getLogger(__name__)
+
 
 def sigmoid_function(T: np.ndarray, a: float, b: float, c: float, d: float) -> np.ndarray:
     """
@@ -20,7 +24,7 @@ def sigmoid_function(T: np.ndarray, a: float, b: float, c: float, d: float) -> n
     Returns:
         Conversion values
     """
-    return d + (a - d) / (1 + np.exp(-b * (T - c)))
+    return d + (a - d) * expit(b * (T - c))
 
 
 def sigmoid_constrained(T: np.ndarray, b: float, c: float) -> np.ndarray:
@@ -39,7 +43,24 @@ def sigmoid_constrained(T: np.ndarray, b: float, c: float) -> np.ndarray:
     At T → +∞: returns 100%
     At T = c: returns 50%
     """
-    return 100.0 / (1 + np.exp(-b * (T - c)))
+    return 100.0 * expit(b * (T - c))
+
+
+def sigmoid_constrained_jacobian(T: np.ndarray, b: float, c: float) -> np.ndarray:
+    """
+    Analytic Jacobian of sigmoid_constrained with respect to (b, c)
+
+    Args:
+        T: Temperature
+        b: Growth rate
+        c: Inflection point temperature (T50)
+
+    Returns:
+        Array of shape (len(T), 2) with columns d/db and d/dc
+    """
+    s = expit(b * (T - c))
+    slope = 100.0 * s * (1 - s)
+    return np.column_stack((slope * (T - c), -slope * b))
 
 
 def calculate_tx(params: np.ndarray, target_conversion: float) -> Optional[float]:
@@ -97,6 +118,7 @@ class SigmoidFitter:
         self.r_squared = None
         self.temperatures = None
         self.conversions = None
+        self._curve_cache = {}  # Fitted curves by (temp_range, num_points), computed on first use
 
     def fit(self, temperatures: np.ndarray, conversions: np.ndarray) -> bool:
         """
@@ -109,8 +131,9 @@ class SigmoidFitter:
         Returns:
             True if fitting succeeded, False otherwise
         """
-        self.temperatures = np.array(temperatures)
-        self.conversions = np.array(conversions)
+        self.temperatures = np.asarray(temperatures, dtype=np.float64)
+        self.conversions = np.asarray(conversions, dtype=np.float64)
+        self._curve_cache = {}
 
         if len(self.temperatures) < 2:
             return False
@@ -132,6 +155,7 @@ class SigmoidFitter:
                 self.temperatures,
                 self.conversions,
                 p0=initial_guess,
+                jac=sigmoid_constrained_jacobian,
                 maxfev=5000,
                 bounds=([0.001, -np.inf], [np.inf, np.inf])  # b must be positive
             )
@@ -145,7 +169,8 @@ class SigmoidFitter:
             return True
 
         except Exception as e:
-            print(f"Fitting error: {e}")
+            # Failed fits are reported in the UI; keep the reason for debugging
+            logger.debug("Fitting error: %s", e)
             return False
 
     def get_fitting_params(self) -> Optional[Dict[str, float]]:
@@ -181,10 +206,17 @@ class SigmoidFitter:
             return {}
 
         b, c = self.popt
+        targets = np.asarray(target_conversions, dtype=np.float64)
+
+        # Inverse sigmoid for all targets at once (same formula as calculate_tx_constrained);
+        # targets outside (0, 100) have no finite TX
+        valid = (targets > 0) & (targets < 100)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tx_values = c - (1/b) * np.log(100.0/targets - 1)
+
         tx_results = {}
-        for target in target_conversions:
-            tx = calculate_tx_constrained(b, c, target)
-            tx_results[f"T{int(target)}"] = tx
+        for target, tx, ok in zip(target_conversions, tx_values, valid):
+            tx_results[f"T{int(target)}"] = tx if ok else None
 
         return tx_results
 
@@ -203,6 +235,12 @@ class SigmoidFitter:
         if self.popt is None:
             return np.array([]), np.array([])
 
+        # Each curve is evaluated once per fit
+        cache_key = (None if temp_range is None else tuple(temp_range), num_points)
+        cached = self._curve_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         if temp_range is None:
             temp_min = self.temperatures.min() - 20
             temp_max = self.temperatures.max() + 20
@@ -212,4 +250,29 @@ class SigmoidFitter:
         temp_fit = np.linspace(temp_min, temp_max, num_points)
         conv_fit = sigmoid_constrained(temp_fit, *self.popt)
 
+        # Shared by every caller, so make accidental in-place edits fail
+        temp_fit.flags.writeable = False
+        conv_fit.flags.writeable = False
+        self._curve_cache[cache_key] = (temp_fit, conv_fit)
         return temp_fit, conv_fit
+
+    def finalize(self, target_conversions: list) -> Dict:
+        """
+        Collect all results of a successful fit
+
+        Args:
+            target_conversions: List of target conversion rates (%)
+
+        Returns:
+            Dictionary with 'fitting_params', 'tx_results', 'temp_fit', 'conv_fit'
+            and 'r_squared'
+        """
+        fitting_params = self.get_fitting_params()
+        temp_fit, conv_fit = self.get_fitted_curve()
+        return {
+            'fitting_params': fitting_params,
+            'tx_results': self.calculate_tx_values(target_conversions),
+            'temp_fit': temp_fit,
+            'conv_fit': conv_fit,
+            'r_squared': fitting_params['r_squared']
+        }
@@ -10,7 +10,10 @@ TEXTS = {
         'language_select': '言語 / Language',
         'file_select': 'データファイル選択',
         'browse_folder': 'フォルダをブラウズ',
+        'refresh_file_list': 'ファイル一覧を更新',
         'select_file': 'ファイルを選択してください',
+        'filter_files': 'ファイル名で絞り込み',
+        'files_shown': '{total}件中{shown}件を表示',
         'no_file_selected': 'ファイルが選択されていません',
         'file_selected': '選択されたファイル',
 
@@ -94,6 +97,7 @@ TEXTS = {
         'protocol_saved': 'パターンが保存されました',
         'protocol_loaded': 'パターンが読み込まれました',
         'enter_protocol_name': 'パターン名を入力してください',
+        'invalid_num_steps': 'ステップ数は1〜20にしてください',
         'delete_protocol': 'パターンを削除',
         'confirm_delete': '本当に削除しますか？',
         'protocol_deleted': 'パターンが削除されました',
@@ -159,7 +163,10 @@ TEXTS = {
         'language_select': 'Language / 言語',
         'file_select': 'Data File Selection',
         'browse_folder': 'Browse Folder',
+        'refresh_file_list': 'Refresh file list',
         'select_file': 'Please select a file',
+        'filter_files': 'Filter files by name',
+        'files_shown': '{shown} of {total} files shown',
         'no_file_selected': 'No file selected',
         'file_selected': 'Selected file',
 
@@ -243,6 +250,7 @@ TEXTS = {
         'protocol_saved': 'Protocol saved successfully',
         'protocol_loaded': 'Protocol loaded successfully',
         'enter_protocol_name': 'Please enter protocol name',
+        'invalid_num_steps': 'Number of steps must be between 1 and 20',
         'delete_protocol': 'Delete Protocol',
         'confirm_delete': 'Are you sure you want to delete?',
         'protocol_deleted': 'Protocol deleted successfully',
@@ -2,9 +2,87 @@
 Settings management module for temperature step protocols
 """
 import json
+import logging
 import os
+import threading
 from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+
+try:
+    import orjson  # Optional: faster JSON encoding for user preferences
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _dump_json(data) -> bytes:
+    """Encode settings data as indented UTF-8 JSON (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _write_temp_json(filepath: str, data) -> str:
+    """
+    Write JSON data to a temporary file next to filepath and return its path
+
+    The name is unique per process and thread, since all Streamlit sessions share
+    one process and may save the same file at once. The temporary file is removed
+    again if writing fails.
+    """
+    temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(_dump_json(data))
+    except BaseException:
+        _remove_if_exists(temp_path)
+        raise
+    return temp_path
+
+
+def _remove_if_exists(filepath: str) -> None:
+    """Delete a file, ignoring it if it is already gone"""
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+
+def _write_json(filepath: str, data) -> None:
+    """
+    Write a JSON settings file atomically
+
+    The data goes to a temporary file that is then swapped in, so the file is
+    never left half-written (e.g. after a crash, or while a sync client reads it).
+    """
+    temp_path = _write_temp_json(filepath, data)
+    try:
+        os.replace(temp_path, filepath)
+    except BaseException:
+        _remove_if_exists(temp_path)
+        raise
+
+
+def _read_json(filepath: str):
+    """Read a JSON settings file (orjson when available)"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _list_json_files(directory: str) -> List[str]:
+    """Sorted names of the .json files in a directory (empty if it doesn't exist)"""
+    try:
+        # scandir yields the file types along with the names, so no stat per entry
+        with os.scandir(directory) as entries:
+            files = [entry.name for entry in entries
+                     if entry.name.endswith('.json') and entry.is_file()]
+    except FileNotFoundError:
+        return []
+    return sorted(files)
 
 
 @dataclass
@@ -33,6 +111,39 @@ class ProtocolSettings:
     mode: str = "standard"  # "standard" or "semi_auto"
     num_reactors: int = 1  # Number of reactors (1 for standard, 2+ for semi-auto)
 
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dictionary"""
+        return {
+            "name": self.name,
+            # Flat dataclass: build the step dicts directly (asdict deep-copies every field)
+            "steps": [
+                {"temperature": step.temperature, "hold_time": step.hold_time, "reactor_id": step.reactor_id}
+                for step in self.steps
+            ],
+            "ramp_time": self.ramp_time,
+            "analysis_time": self.analysis_time,
+            "mode": self.mode,
+            "num_reactors": self.num_reactors
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ProtocolSettings":
+        """Create from a dictionary (as produced by to_dict or read from a settings file)"""
+        # Handle backward compatibility for steps without reactor_id (default to reactor 1)
+        steps = [
+            TemperatureStep(step_data['temperature'], step_data['hold_time'], step_data.get('reactor_id', 1))
+            for step_data in data['steps']
+        ]
+
+        return cls(
+            name=data['name'],
+            steps=steps,
+            ramp_time=data['ramp_time'],
+            analysis_time=data['analysis_time'],
+            mode=data.get('mode', 'standard'),  # Default to standard for old files
+            num_reactors=data.get('num_reactors', 1)  # Default to 1 for old files
+        )
+
 
 class SettingsManager:
     """Manage protocol settings files"""
@@ -46,36 +157,46 @@ class SettingsManager:
         """
         # Use relative path from the app root
         self.settings_dir = settings_dir
-        self._ensure_settings_dir()
+        self.calibration_dir = os.path.join(settings_dir, "calibrations")
+        self._ensure_calibration_dir()  # Also creates settings_dir
         self._create_default_settings()
         self._create_default_calibration()
 
-    def _ensure_settings_dir(self):
-        """Create settings directory if it doesn't exist"""
-        if not os.path.exists(self.settings_dir):
-            os.makedirs(self.settings_dir, exist_ok=True)
+    @staticmethod
+    def _write_if_missing(filepath: str, data: Dict):
+        """
+        Write a JSON file unless it already exists
+
+        The complete file is written under a temporary name and then hard-linked
+        into place, which fails if the target exists. A failed write therefore
+        can't leave an empty or truncated file that would never be recreated.
+        """
+        temp_path = _write_temp_json(filepath, data)
+        try:
+            os.link(temp_path, filepath)
+        except FileExistsError:
+            pass
+        finally:
+            _remove_if_exists(temp_path)
 
     def _create_default_settings(self):
         """Create default settings file if it doesn't exist"""
-        default_path = os.path.join(self.settings_dir, "default.json")
-
-        if not os.path.exists(default_path):
-            default_settings = ProtocolSettings(
-                name="Standard Protocol (500-150°C)",
-                steps=[
-                    TemperatureStep(500, 20),
-                    TemperatureStep(450, 20),
-                    TemperatureStep(400, 20),
-                    TemperatureStep(350, 20),
-                    TemperatureStep(300, 20),
-                    TemperatureStep(250, 20),
-                    TemperatureStep(200, 20),
-                    TemperatureStep(150, 20),
-                ],
-                ramp_time=10,
-                analysis_time=10
-            )
-            self.save_settings(default_settings, "default.json")
+        default_settings = ProtocolSettings(
+            name="Standard Protocol (500-150°C)",
+            steps=[
+                TemperatureStep(500, 20),
+                TemperatureStep(450, 20),
+                TemperatureStep(400, 20),
+                TemperatureStep(350, 20),
+                TemperatureStep(300, 20),
+                TemperatureStep(250, 20),
+                TemperatureStep(200, 20),
+                TemperatureStep(150, 20),
+            ],
+            ramp_time=10,
+            analysis_time=10
+        )
+        self._write_if_missing(os.path.join(self.settings_dir, "default.json"), default_settings.to_dict())
 
     def save_settings(self, settings: ProtocolSettings, filename: str) -> str:
         """
@@ -91,17 +212,9 @@ class SettingsManager:
         filepath = os.path.join(self.settings_dir, filename)
 
         # Convert to dictionary
-        settings_dict = {
-            "name": settings.name,
-            "steps": [asdict(step) for step in settings.steps],
-            "ramp_time": settings.ramp_time,
-            "analysis_time": settings.analysis_time,
-            "mode": settings.mode,
-            "num_reactors": settings.num_reactors
-        }
+        settings_dict = settings.to_dict()
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(settings_dict, f, indent=2, ensure_ascii=False)
+        _write_json(filepath, settings_dict)
 
         return filepath
 
@@ -117,33 +230,15 @@ class SettingsManager:
         """
         filepath = os.path.join(self.settings_dir, filename)
 
-        if not os.path.exists(filepath):
-            return None
-
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(filepath)
 
-            # Handle backward compatibility for steps without reactor_id
-            steps = []
-            for step_data in data['steps']:
-                if 'reactor_id' not in step_data:
-                    step_data['reactor_id'] = 1  # Default to reactor 1
-                steps.append(TemperatureStep(**step_data))
-
-            settings = ProtocolSettings(
-                name=data['name'],
-                steps=steps,
-                ramp_time=data['ramp_time'],
-                analysis_time=data['analysis_time'],
-                mode=data.get('mode', 'standard'),  # Default to standard for old files
-                num_reactors=data.get('num_reactors', 1)  # Default to 1 for old files
-            )
-
-            return settings
+            return ProtocolSettings.from_dict(data)
 
+        except FileNotFoundError:
+            return None
         except Exception as e:
-            print(f"Error loading settings: {e}")
+            logger.warning("Error loading settings: %s", e)
             return None
 
     def list_settings_files(self) -> List[str]:
@@ -153,11 +248,7 @@ class SettingsManager:
         Returns:
             List of filenames (without path)
         """
-        if not os.path.exists(self.settings_dir):
-            return []
-
-        files = [f for f in os.listdir(self.settings_dir) if f.endswith('.json')]
-        return sorted(files)
+        return _list_json_files(self.settings_dir)
 
     def delete_settings(self, filename: str) -> bool:
         """
@@ -169,16 +260,19 @@ class SettingsManager:
         Returns:
             True if successful, False otherwise
         """
+        if filename == "default.json":
+            return False
+
         filepath = os.path.join(self.settings_dir, filename)
 
-        if os.path.exists(filepath) and filename != "default.json":
-            try:
-                os.remove(filepath)
-                return True
-            except Exception as e:
-                print(f"Error deleting settings: {e}")
-                return False
-        return False
+        try:
+            os.remove(filepath)
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning("Error deleting settings: %s", e)
+            return False
 
     def get_default_settings(self) -> ProtocolSettings:
         """
@@ -198,67 +292,51 @@ class SettingsManager:
 
     def _ensure_calibration_dir(self):
         """Create calibration directory if it doesn't exist"""
-        cal_dir = os.path.join(self.settings_dir, "calibrations")
-        if not os.path.exists(cal_dir):
-            os.makedirs(cal_dir, exist_ok=True)
-        return cal_dir
+        os.makedirs(self.calibration_dir, exist_ok=True)
 
     def _create_default_calibration(self):
         """Create default calibration if it doesn't exist"""
-        cal_dir = self._ensure_calibration_dir()
-        default_path = os.path.join(cal_dir, "default.json")
-        if not os.path.exists(default_path):
-            default_cal = CalibrationSettings(
-                name="Default",
-                slope=-995.32,
-                intercept=101.36
-            )
-            self.save_calibration(default_cal, "default.json")
+        default_cal = {"name": "Default", "slope": -995.32, "intercept": 101.36}
+        self._write_if_missing(os.path.join(self.calibration_dir, "default.json"), default_cal)
 
     def save_calibration(self, cal: CalibrationSettings, filename: str) -> str:
         """Save calibration settings to JSON file"""
-        cal_dir = self._ensure_calibration_dir()
-        filepath = os.path.join(cal_dir, filename)
+        self._ensure_calibration_dir()
+        filepath = os.path.join(self.calibration_dir, filename)
         cal_dict = {"name": cal.name, "slope": cal.slope, "intercept": cal.intercept}
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(cal_dict, f, indent=2, ensure_ascii=False)
+        _write_json(filepath, cal_dict)
         return filepath
 
     def load_calibration(self, filename: str) -> Optional[CalibrationSettings]:
         """Load calibration settings from JSON file"""
-        cal_dir = self._ensure_calibration_dir()
-        filepath = os.path.join(cal_dir, filename)
-        if not os.path.exists(filepath):
-            return None
+        filepath = os.path.join(self.calibration_dir, filename)
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(filepath)
             return CalibrationSettings(
                 name=data['name'],
                 slope=data['slope'],
                 intercept=data.get('intercept', 0.0)
             )
+        except FileNotFoundError:
+            return None
         except Exception as e:
-            print(f"Error loading calibration: {e}")
+            logger.warning("Error loading calibration: %s", e)
             return None
 
     def list_calibration_files(self) -> List[str]:
         """Get list of available calibration files"""
-        cal_dir = self._ensure_calibration_dir()
-        files = [f for f in os.listdir(cal_dir) if f.endswith('.json')]
-        return sorted(files)
+        return _list_json_files(self.calibration_dir)
 
     def delete_calibration(self, filename: str) -> bool:
         """Delete a calibration file (cannot delete default)"""
-        cal_dir = self._ensure_calibration_dir()
-        filepath = os.path.join(cal_dir, filename)
-        if os.path.exists(filepath) and filename != "default.json":
-            try:
-                os.remove(filepath)
-                return True
-            except Exception:
-                return False
-        return False
+        if filename == "default.json":
+            return False
+        filepath = os.path.join(self.calibration_dir, filename)
+        try:
+            os.remove(filepath)
+            return True
+        except Exception:
+            return False
 
     def save_user_preferences(self, preferences: Dict) -> str:
         """
@@ -272,8 +350,7 @@ class SettingsManager:
         """
         filepath = os.path.join(self.settings_dir, "user_preferences.json")
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(preferences, f, indent=2, ensure_ascii=False)
+        _write_json(filepath, preferences)
 
         return filepath
 
@@ -286,13 +363,11 @@ class SettingsManager:
         """
         filepath = os.path.join(self.settings_dir, "user_preferences.json")
 
-        if not os.path.exists(filepath):
-            return None
-
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                preferences = json.load(f)
+            preferences = _read_json(filepath)
             return preferences
+        except FileNotFoundError:
+            return None
         except Exception as e:
-            print(f"Error loading user preferences: {e}")
+            logger.warning("Error loading user preferences: %s", e)
             return None
@@ -1,64 +1,113 @@
 """
 Visualization module for benzene oxidation activity analysis
 """
-import matplotlib.pyplot as plt
+import matplotlib
 import matplotlib.font_manager as fm
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
 import numpy as np
+from functools import lru_cache
+from itertools import cycle
 from typing import Dict, Optional, Tuple, List
 import os
 
-
-def find_japanese_font():
-    """Find available Japanese fonts"""
-    japanese_fonts = []
-
+# Write buffer for saved images, so a large PNG goes to disk in a few big writes
+SAVE_BUFFER_SIZE = 1024 * 1024
+
+# Merge nearly collinear line segments (< 1 px deviation) before rasterizing
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+
+# Plot palettes (cycled when there are more items than entries)
+TX_COLORS = ('green', 'orange', 'purple', 'brown', 'pink', 'cyan', 'magenta')  # TX guide lines/markers
+STEP_COLORS = ('red', 'orange', 'yellow', 'green', 'cyan', 'blue', 'purple', 'magenta')  # Temperature steps
+REACTOR_BG_COLORS = (  # Time-series backgrounds per reactor (semi-auto mode)
+    (1.0, 0.8, 0.8, 0.3),   # Light red (reactor 1)
+    (0.8, 0.8, 1.0, 0.3),   # Light blue (reactor 2)
+    (0.8, 1.0, 0.8, 0.3),   # Light green (reactor 3)
+    (1.0, 1.0, 0.8, 0.3),   # Light yellow (reactor 4)
+    (1.0, 0.8, 1.0, 0.3),   # Light magenta (reactor 5)
+    (0.8, 1.0, 1.0, 0.3),   # Light cyan (reactor 6)
+)
+REACTOR_COLORS = ('red', 'blue', 'green', 'orange', 'purple', 'brown')
+REACTOR_MARKERS = ('o', 's', '^', 'D', 'v', '<')
+SAMPLE_COLORS = ('red', 'blue', 'green', 'orange', 'purple', 'brown', 'pink', 'cyan', 'olive', 'magenta')
+SAMPLE_MARKERS = ('o', 's', '^', 'D', 'v', '<', '>', 'p', 'h', '*')
+
+# Font candidates, in order of preference
+JAPANESE_FONTS = (
     # Windows standard fonts
-    windows_fonts = ['Yu Gothic', 'Yu Gothic UI', 'Meiryo', 'Meiryo UI',
-                    'MS Gothic', 'MS UI Gothic', 'MS PGothic', 'MS PMincho']
-
+    'Yu Gothic', 'Yu Gothic UI', 'Meiryo', 'Meiryo UI',
+    'MS Gothic', 'MS UI Gothic', 'MS PGothic', 'MS PMincho',
     # Linux/Mac fonts
-    unix_fonts = ['Takao', 'IPAexGothic', 'IPAPGothic', 'VL PGothic',
-                 'Noto Sans CJK JP', 'Hiragino Sans', 'Hiragino Kaku Gothic Pro']
-
-    all_fonts = windows_fonts + unix_fonts
-
+    'Takao', 'IPAexGothic', 'IPAPGothic', 'VL PGothic',
+    'Noto Sans CJK JP', 'Hiragino Sans', 'Hiragino Kaku Gothic Pro',
+)
+COMMON_FONTS = ('Times New Roman', 'Arial', 'Helvetica', 'DejaVu Sans', 'DejaVu Serif',
+                'Calibri', 'Cambria', 'Georgia', 'Verdana')
+
+# Plot text per language (anything other than 'ja' uses English)
+PLOT_LABELS = {
+    'ja': {
+        'temperature': '温度 (℃)',
+        'conversion': '転換率 (%)',
+        'temp_unit': '℃',
+        'exp_data': '実測データ',
+        'sigmoid_fit': 'シグモイドフィット',
+        'fit': 'フィット',
+        'reactor': '反応管{}',
+        'time': '時間 (分)',
+        'intensity': '強度',
+        'timeseries_title': '時系列データと各温度ステップ',
+        'raw_data': '生データ',
+    },
+    'en': {
+        'temperature': 'Temperature (°C)',
+        'conversion': 'Conversion (%)',
+        'temp_unit': '°C',
+        'exp_data': 'Experimental Data',
+        'sigmoid_fit': 'Sigmoid Fit',
+        'fit': 'Fit',
+        'reactor': 'Reactor {}',
+        'time': 'Time (min)',
+        'intensity': 'Intensity',
+        'timeseries_title': 'Time-Series Data and Temperature Steps',
+        'raw_data': 'Raw Data',
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def _installed_font_names() -> frozenset:
+    """Names of all fonts known to matplotlib's font manager (scanned once per process)"""
+    return frozenset(f.name for f in fm.fontManager.ttflist)
+
+
+@lru_cache(maxsize=None)
+def find_japanese_font() -> Tuple[str, ...]:
+    """Find available Japanese fonts"""
     # Get installed fonts
-    available_fonts = [f.name for f in fm.fontManager.ttflist]
+    available_fonts = _installed_font_names()
 
     # Search for Japanese fonts
-    for font in all_fonts:
-        if font in available_fonts:
-            japanese_fonts.append(font)
-
-    return japanese_fonts
+    return tuple(font for font in JAPANESE_FONTS if font in available_fonts)
 
 
 def get_available_fonts():
     """Get list of available fonts for plotting"""
-    # Common fonts that should be available
-    common_fonts = [
-        'Times New Roman',
-        'Arial',
-        'Helvetica',
-        'DejaVu Sans',
-        'DejaVu Serif',
-        'Calibri',
-        'Cambria',
-        'Georgia',
-        'Verdana'
-    ]
-
     # Add Japanese fonts if available
     japanese_fonts = find_japanese_font()
 
     # Get all available fonts
-    available_fonts = [f.name for f in fm.fontManager.ttflist]
+    available_fonts = _installed_font_names()
 
     # Filter to only include fonts that exist
-    available = []
-    for font in common_fonts:
-        if font in available_fonts:
-            available.append(font)
+    available = [font for font in COMMON_FONTS if font in available_fonts]
 
     # Add Japanese fonts
     for font in japanese_fonts:
@@ -85,16 +134,29 @@ def setup_matplotlib_font(font_name='Times New Roman', language='en'):
         japanese_fonts = find_japanese_font()
         if japanese_fonts:
             # Set font list with fallback
-            plt.rcParams['font.sans-serif'] = [japanese_fonts[0], font_name, 'DejaVu Sans']
-            plt.rcParams['font.family'] = 'sans-serif'
+            matplotlib.rcParams['font.sans-serif'] = [japanese_fonts[0], font_name, 'DejaVu Sans']
+            matplotlib.rcParams['font.family'] = 'sans-serif'
         else:
-            plt.rcParams['font.family'] = font_name
+            matplotlib.rcParams['font.family'] = font_name
     else:
         # For English, use the specified font
-        plt.rcParams['font.sans-serif'] = [font_name, 'DejaVu Sans', 'Arial']
-        plt.rcParams['font.family'] = 'sans-serif'
+        matplotlib.rcParams['font.sans-serif'] = [font_name, 'DejaVu Sans', 'Arial']
+        matplotlib.rcParams['font.family'] = 'sans-serif'
+
+    matplotlib.rcParams['axes.unicode_minus'] = False
+
+
+def _new_figure(figsize: Tuple[float, float]) -> Tuple[Figure, Axes]:
+    """
+    Create a figure with a single Axes, outside of pyplot's figure manager
 
-    plt.rcParams['axes.unicode_minus'] = False
+    Figures are cached (and evicted) by the app; pyplot would keep a reference
+    to every figure it ever created until plt.close() is called.
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    return fig, ax
 
 
 def create_activity_plot(
@@ -110,7 +172,7 @@ def create_activity_plot(
     label_fontsize: int = 14,
     tick_fontsize: int = 12,
     legend_fontsize: int = 12
-) -> plt.Figure:
+) -> Figure:
     """
     Create benzene oxidation activity plot
 
@@ -135,21 +197,15 @@ def create_activity_plot(
     setup_matplotlib_font(font_name, language)
 
     # Text labels
-    if language == 'ja':
-        xlabel = '温度 (℃)'
-        ylabel = '転換率 (%)'
-        exp_data = '実測データ'
-        sigmoid_fit = 'シグモイドフィット'
-        temp_unit = '℃'
-    else:
-        xlabel = 'Temperature (°C)'
-        ylabel = 'Conversion (%)'
-        exp_data = 'Experimental Data'
-        sigmoid_fit = 'Sigmoid Fit'
-        temp_unit = '°C'
+    labels = PLOT_LABELS.get(language, PLOT_LABELS['en'])
+    xlabel = labels['temperature']
+    ylabel = labels['conversion']
+    exp_data = labels['exp_data']
+    sigmoid_fit = labels['sigmoid_fit']
+    temp_unit = labels['temp_unit']
 
     # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _new_figure(figsize)
 
     # Plot experimental data
     ax.scatter(temperatures, conversions, color='red', s=80,
@@ -160,28 +216,36 @@ def create_activity_plot(
            label=f'{sigmoid_fit} (R²={r_squared:.3f})')
 
     # Plot TX points
-    colors = ['green', 'orange', 'purple', 'brown', 'pink', 'cyan', 'magenta']
-    for i, (key, tx_temp) in enumerate(sorted(tx_results.items())):
-        if tx_temp is not None:
-            # Extract target conversion from key (e.g., 'T20' -> 20)
-            target = int(key[1:])
-
-            # Plot horizontal and vertical lines
-            ax.axhline(y=target, color=colors[i % len(colors)],
-                      linestyle='--', alpha=0.5, linewidth=1)
-            ax.axvline(x=tx_temp, color=colors[i % len(colors)],
-                      linestyle='--', alpha=0.5, linewidth=1)
-
-            # Plot TX point marker
-            ax.plot(tx_temp, target, 'o', color=colors[i % len(colors)],
-                   markersize=10, label=f'{key}={tx_temp:.1f}{temp_unit}',
-                   markeredgecolor='black', markeredgewidth=1)
+    tx_points = [
+        (key, tx_temp, int(key[1:]), color)  # 'T20' -> target 20
+        for (key, tx_temp), color in zip(sorted(tx_results.items()), cycle(TX_COLORS))
+        if tx_temp is not None
+    ]
+    legend_handles, _ = ax.get_legend_handles_labels()
+    if tx_points:
+        _, tx_temps, targets, tx_colors = zip(*tx_points)
+
+        # Guide lines across the whole axes (like axhline/axvline), one collection each
+        ax.hlines(targets, 0, 1, transform=ax.get_yaxis_transform(), colors=tx_colors,
+                  linestyles='--', alpha=0.5, linewidth=1, zorder=2)
+        ax.vlines(tx_temps, 0, 1, transform=ax.get_xaxis_transform(), colors=tx_colors,
+                  linestyles='--', alpha=0.5, linewidth=1, zorder=2)
+
+        # TX point markers in one scatter, with a legend entry per point
+        ax.scatter(tx_temps, targets, s=100, c=tx_colors, edgecolors='black',
+                   linewidths=1, zorder=2)
+        legend_handles += [
+            Line2D([], [], linestyle='', marker='o', color=color, markersize=10,
+                   markeredgecolor='black', markeredgewidth=1,
+                   label=f'{key}={tx_temp:.1f}{temp_unit}')
+            for key, tx_temp, _, color in tx_points
+        ]
 
     # Set labels and grid
     ax.set_xlabel(xlabel, fontsize=label_fontsize)
     ax.set_ylabel(ylabel, fontsize=label_fontsize)
     ax.grid(True, alpha=0.3)
-    ax.legend(fontsize=legend_fontsize, loc='best')
+    ax.legend(handles=legend_handles, fontsize=legend_fontsize, loc='best')
 
     # Set tick label font size
     ax.tick_params(axis='both', which='major', labelsize=tick_fontsize)
@@ -190,17 +254,46 @@ def create_activity_plot(
     ax.set_xlim(temperatures.min() - 30, temperatures.max() + 30)
 
     # Calculate Y-axis limits dynamically based on data
-    all_conv_data = np.concatenate([conversions, conv_fit])
-    y_min = min(all_conv_data.min(), 0)  # Include 0 if data is all positive
-    y_max = max(all_conv_data.max(), 100)  # Include 100 if data is below 100
+    y_min = min(conversions.min(), conv_fit.min(), 0)  # Include 0 if data is all positive
+    y_max = max(conversions.max(), conv_fit.max(), 100)  # Include 100 if data is below 100
     y_margin = (y_max - y_min) * 0.05  # 5% margin
     ax.set_ylim(y_min - y_margin, y_max + y_margin)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig
 
 
+def _decimate_minmax(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a dense trace to at most max_points (+ 2 end) points for drawing
+
+    The trace is split into equal bins and only each bin's minimum and maximum
+    (in time order) are kept, so peaks and the overall envelope are preserved.
+    The first and last points are always kept so the x extent doesn't change.
+    """
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    bin_size = -(-n // (max_points // 2))  # ceil division
+    n_full = (n // bin_size) * bin_size
+    bins = y[:n_full].reshape(-1, bin_size)
+    offsets = np.arange(0, n_full, bin_size)
+    i_min = bins.argmin(axis=1) + offsets
+    i_max = bins.argmax(axis=1) + offsets
+
+    idx = [i_min, i_max, [0, n - 1]]
+    if n_full < n:
+        # Leftover tail (shorter than a bin)
+        tail = y[n_full:]
+        idx.append([n_full + tail.argmin(), n_full + tail.argmax()])
+
+    # Sorted and de-duplicated
+    idx = np.unique(np.concatenate(idx))
+    return x[idx], y[idx]
+
+
 def create_timeseries_plot(
     times: np.ndarray,
     intensities: np.ndarray,
@@ -210,8 +303,9 @@ def create_timeseries_plot(
     label_fontsize: int = 12,
     tick_fontsize: int = 10,
     semi_auto_mode: bool = False,
-    num_reactors: int = 1
-) -> plt.Figure:
+    num_reactors: int = 1,
+    max_points: Optional[int] = None
+) -> Figure:
     """
     Create time-series plot showing raw data and temperature steps
 
@@ -225,52 +319,60 @@ def create_timeseries_plot(
         tick_fontsize: Font size for tick labels
         semi_auto_mode: Whether in semi-auto mode (multiple reactors)
         num_reactors: Number of reactors
+        max_points: Maximum number of raw points to draw (min/max decimated above this, at least 4;
+            None draws all)
 
     Returns:
         matplotlib Figure object
     """
+    if max_points is not None and max_points < 4:
+        raise ValueError(f"max_points must be at least 4 (or None to draw all points), got {max_points}")
+
     # Setup font with fallback support
     setup_matplotlib_font(font_name, language)
 
     # Text labels
-    if language == 'ja':
-        xlabel = '時間 (分)'
-        ylabel = '強度'
-        title = '時系列データと各温度ステップ'
-        raw_data_label = '生データ'
-        reactor_label = '反応管{}'
-    else:
-        xlabel = 'Time (min)'
-        ylabel = 'Intensity'
-        title = 'Time-Series Data and Temperature Steps'
-        raw_data_label = 'Raw Data'
-        reactor_label = 'Reactor {}'
+    labels = PLOT_LABELS.get(language, PLOT_LABELS['en'])
+    xlabel = labels['time']
+    ylabel = labels['intensity']
+    title = labels['timeseries_title']
+    raw_data_label = labels['raw_data']
+    reactor_label = labels['reactor']
 
     # Create figure
-    fig, ax = plt.subplots(figsize=(12, 4))
+    fig, ax = _new_figure((12, 4))
+
+    # Long traces have many samples per pixel; draw only the per-bin min/max
+    plot_times, plot_intensities = times, intensities
+    if max_points is not None:
+        plot_times, plot_intensities = _decimate_minmax(times, intensities, max_points)
 
     # Convert time from seconds to minutes
-    times_min = times / 60.0
+    times_min = plot_times / 60.0
 
     # Plot raw data
-    ax.plot(times_min, intensities, 'k-', linewidth=0.5, alpha=0.5, label=raw_data_label)
-
-    # Define colors for each temperature step (for standard mode)
-    temp_colors = ['red', 'orange', 'yellow', 'green', 'cyan', 'blue', 'purple', 'magenta']
-
-    # Define distinct background colors for each reactor (for semi-auto mode)
-    reactor_bg_colors = [
-        (1.0, 0.8, 0.8, 0.3),   # Light red (reactor 1)
-        (0.8, 0.8, 1.0, 0.3),   # Light blue (reactor 2)
-        (0.8, 1.0, 0.8, 0.3),   # Light green (reactor 3)
-        (1.0, 1.0, 0.8, 0.3),   # Light yellow (reactor 4)
-        (1.0, 0.8, 1.0, 0.3),   # Light magenta (reactor 5)
-        (0.8, 1.0, 1.0, 0.3),   # Light cyan (reactor 6)
-    ]
+    raw_line, = ax.plot(times_min, plot_intensities, 'k-', linewidth=0.5, alpha=0.5, label=raw_data_label)
 
     # Track which labels have been added
     added_labels = set()
 
+    # Step regions span the full axes height (like axvspan); all of them are collected
+    # into one PolyCollection, with a legend patch per temperature/reactor
+    span_verts = []
+    span_colors = []
+    span_handles = []
+    boundaries = []
+
+    if semi_auto_mode:
+        # Temperature annotations go just below the top of the raw data
+        y_top = ax.get_ylim()[1]
+        y_pos = y_top if y_top != 1.0 else intensities.max()
+    else:
+        # Assign colors to the unique temperatures (high to low)
+        unique_temps = sorted({d['temperature'] for d in temp_data.values()}, reverse=True)
+        temp_span_colors = {t: to_rgba(color, 0.3)
+                            for t, color in zip(unique_temps, cycle(STEP_COLORS))}
+
     # Plot each temperature step region
     sorted_steps = sorted(temp_data.keys())
     for step_idx in sorted_steps:
@@ -282,7 +384,8 @@ def create_timeseries_plot(
 
         if semi_auto_mode:
             # Use reactor-based background colors
-            bg_color = reactor_bg_colors[(reactor_id - 1) % len(reactor_bg_colors)]
+            bg_color = REACTOR_BG_COLORS[(reactor_id - 1) % len(REACTOR_BG_COLORS)]
+            span_color = bg_color
 
             # Only add label for first occurrence of each reactor
             label = None
@@ -290,21 +393,13 @@ def create_timeseries_plot(
                 label = reactor_label.format(reactor_id)
                 added_labels.add(reactor_id)
 
-            # Fill background with reactor color
-            ax.axvspan(time_start_min, time_end_min, color=bg_color[:3], alpha=bg_color[3],
-                      label=label)
-
             # Add temperature annotation
             mid_time = (time_start_min + time_end_min) / 2
-            y_pos = ax.get_ylim()[1] if ax.get_ylim()[1] != 1.0 else intensities.max()
             ax.text(mid_time, y_pos * 0.95, f'{int(temp)}°C',
                    ha='center', va='top', fontsize=8, alpha=0.7)
         else:
             # Standard mode - color by temperature
-            # Get unique temperatures to assign colors
-            unique_temps = sorted(set(d['temperature'] for d in temp_data.values()), reverse=True)
-            temp_idx = unique_temps.index(temp)
-            color = temp_colors[temp_idx % len(temp_colors)]
+            span_color = temp_span_colors[temp]
 
             # Only add label for first occurrence of each temperature
             label = None
@@ -312,22 +407,40 @@ def create_timeseries_plot(
                 label = f'{temp}°C'
                 added_labels.add(temp)
 
-            ax.axvspan(time_start_min, time_end_min, alpha=0.3, color=color, label=label)
-
-        # Add vertical lines at boundaries
-        ax.axvline(time_start_min, color='gray', linestyle='--', linewidth=0.5, alpha=0.3)
+        span_verts.append([(time_start_min, 0), (time_end_min, 0), (time_end_min, 1), (time_start_min, 1)])
+        span_colors.append(span_color)
+        if label is not None:
+            span_handles.append(Patch(color=span_color, label=label))
+        boundaries.append(time_start_min)
+
+    if span_verts:
+        # Fill backgrounds (x in data coordinates, y in axes coordinates). How collections
+        # with a blended transform autoscale differs between matplotlib versions (older ones
+        # add the 0-1 axes span to the intensity limits), so only the x extent of the
+        # regions is added to the data limits, as axvspan does
+        ax.add_collection(PolyCollection(span_verts, facecolors=span_colors, edgecolors=span_colors,
+                                         transform=ax.get_xaxis_transform(), zorder=1),
+                          autolim=False)
+        ax.update_datalim(np.reshape(span_verts, (-1, 2)), updatey=False)
+        ax.autoscale_view()
+
+        # Add vertical lines at boundaries (also kept out of autoscaling)
+        ax.add_collection(LineCollection([[(x, 0), (x, 1)] for x in boundaries],
+                                         colors='gray', linestyles='--', linewidths=0.5, alpha=0.3,
+                                         transform=ax.get_xaxis_transform()),
+                          autolim=False)
 
     # Set labels and title
     ax.set_xlabel(xlabel, fontsize=label_fontsize)
     ax.set_ylabel(ylabel, fontsize=label_fontsize)
     ax.set_title(title, fontsize=label_fontsize + 2)
     ax.grid(True, alpha=0.3)
-    ax.legend(fontsize=10, loc='upper left', ncol=4)
+    ax.legend(handles=[raw_line, *span_handles], fontsize=10, loc='upper left', ncol=4)
 
     # Set tick label font size
     ax.tick_params(axis='both', which='major', labelsize=tick_fontsize)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig
 
@@ -341,7 +454,7 @@ def create_simple_activity_plot(
     label_fontsize: int = 14,
     tick_fontsize: int = 12,
     legend_fontsize: int = 12
-) -> plt.Figure:
+) -> Figure:
     """
     Create simple activity plot with experimental data only (no fitting)
 
@@ -362,26 +475,27 @@ def create_simple_activity_plot(
     setup_matplotlib_font(font_name, language)
 
     # Text labels
-    if language == 'ja':
-        xlabel = '温度 (℃)'
-        ylabel = '転換率 (%)'
-        exp_data = '実測データ'
-    else:
-        xlabel = 'Temperature (°C)'
-        ylabel = 'Conversion (%)'
-        exp_data = 'Experimental Data'
+    labels = PLOT_LABELS.get(language, PLOT_LABELS['en'])
+    xlabel = labels['temperature']
+    ylabel = labels['conversion']
+    exp_data = labels['exp_data']
 
     # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = _new_figure(figsize)
 
     # Plot experimental data
     ax.scatter(temperatures, conversions, color='red', s=80,
               label=exp_data, zorder=5, alpha=0.8)
 
-    # Connect points with line
-    sorted_indices = np.argsort(temperatures)
-    ax.plot(temperatures[sorted_indices], conversions[sorted_indices],
-           'k--', linewidth=1, alpha=0.3)
+    # Connect points with line (protocols usually step monotonically, e.g. 500 -> 150°C,
+    # in which case the points are already in drawing order)
+    temp_steps = np.diff(temperatures)
+    if np.all(temp_steps <= 0) or np.all(temp_steps >= 0):
+        line_temps, line_convs = temperatures, conversions
+    else:
+        sorted_indices = np.argsort(temperatures)
+        line_temps, line_convs = temperatures[sorted_indices], conversions[sorted_indices]
+    ax.plot(line_temps, line_convs, 'k--', linewidth=1, alpha=0.3)
 
     # Set labels and grid
     ax.set_xlabel(xlabel, fontsize=label_fontsize)
@@ -401,13 +515,15 @@ def create_simple_activity_plot(
     y_margin = (y_max - y_min) * 0.05  # 5% margin
     ax.set_ylim(y_min - y_margin, y_max + y_margin)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig
 
 
 def create_comparison_plot(
-    reactor_data: Dict[int, Dict],
+    temperatures: np.ndarray,
+    conversions: np.ndarray,
+    reactor_ids: List[int],
     fitting_results: Dict[int, Dict],
     language: str = 'ja',
     figsize: Tuple[int, int] = (12, 8),
@@ -415,13 +531,15 @@ def create_comparison_plot(
     label_fontsize: int = 14,
     tick_fontsize: int = 12,
     legend_fontsize: int = 12
-) -> plt.Figure:
+) -> Figure:
     """
     Create comparison plot overlaying multiple reactor activity curves
 
     Args:
-        reactor_data: Dict[reactor_id: {'temperatures': array, 'conversions': array, ...}]
-        fitting_results: Dict[reactor_id: {'temp_fit': array, 'conv_fit': array, 'tx_results': dict, 'r_squared': float}]
+        temperatures: 2D array (reactor, point) of temperatures, NaN-padded
+        conversions: 2D array (reactor, point) of conversions, NaN-padded
+        reactor_ids: Reactor ID for each row of temperatures/conversions
+        fitting_results: Dict[reactor_id: {'success': bool, 'temp_fit': array, 'conv_fit': array, 'r_squared': float, ...}]
         language: 'ja' or 'en'
         figsize: Figure size
         font_name: Font name for the plot
@@ -436,76 +554,65 @@ def create_comparison_plot(
     setup_matplotlib_font(font_name, language)
 
     # Text labels
-    if language == 'ja':
-        xlabel = '温度 (℃)'
-        ylabel = '転換率 (%)'
-        reactor_label = '反応管{}'
-        fit_label = 'フィット'
-    else:
-        xlabel = 'Temperature (°C)'
-        ylabel = 'Conversion (%)'
-        reactor_label = 'Reactor {}'
-        fit_label = 'Fit'
+    labels = PLOT_LABELS.get(language, PLOT_LABELS['en'])
+    xlabel = labels['temperature']
+    ylabel = labels['conversion']
+    reactor_label = labels['reactor']
+    fit_label = labels['fit']
 
     # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
-
-    # Define colors for each reactor
-    reactor_colors = ['red', 'blue', 'green', 'orange', 'purple', 'brown']
-    markers = ['o', 's', '^', 'D', 'v', '<']
-
-    all_temps = []
-    all_convs = []
-
-    # Plot each reactor's data
-    for i, reactor_id in enumerate(sorted(reactor_data.keys())):
-        data = reactor_data[reactor_id]
-        temperatures = data['temperatures']
-        conversions = data['conversions']
-        color = reactor_colors[i % len(reactor_colors)]
-        marker = markers[i % len(markers)]
-
-        all_temps.extend(temperatures)
-        all_convs.extend(conversions)
-
-        # Plot experimental data
-        ax.scatter(temperatures, conversions, color=color, s=80, marker=marker,
-                  label=f'{reactor_label.format(reactor_id)} (data)', zorder=5, alpha=0.8)
-
-        # Plot fitted curve if available
-        if reactor_id in fitting_results and fitting_results[reactor_id] is not None:
-            fit_data = fitting_results[reactor_id]
-            temp_fit = fit_data['temp_fit']
-            conv_fit = fit_data['conv_fit']
-            r_squared = fit_data['r_squared']
-
-            all_convs.extend(conv_fit)
-
-            ax.plot(temp_fit, conv_fit, color=color, linewidth=2,
-                   label=f'{reactor_label.format(reactor_id)} {fit_label} (R²={r_squared:.3f})',
-                   linestyle='-')
+    fig, ax = _new_figure(figsize)
+
+    # Plot each reactor's data (one scatter per reactor for distinct markers)
+    legend_handles = {}
+    for i, reactor_id in enumerate(reactor_ids):
+        legend_handles[reactor_id] = [ax.scatter(
+            temperatures[i], conversions[i],
+            color=REACTOR_COLORS[i % len(REACTOR_COLORS)], s=80,
+            marker=REACTOR_MARKERS[i % len(REACTOR_MARKERS)],
+            label=f'{reactor_label.format(reactor_id)} (data)', zorder=5, alpha=0.8
+        )]
+
+    # Plot all fitted curves with a single call (columns = reactors)
+    fitted = [(i, reactor_id) for i, reactor_id in enumerate(reactor_ids)
+              if fitting_results.get(reactor_id, {}).get('success', False)]
+    fit_convs = np.empty((0,))
+    if fitted:
+        fit_temps = np.column_stack([fitting_results[rid]['temp_fit'] for _, rid in fitted])
+        fit_convs = np.column_stack([fitting_results[rid]['conv_fit'] for _, rid in fitted])
+        fit_lines = ax.plot(fit_temps, fit_convs, linewidth=2, linestyle='-')
+        for line, (i, reactor_id) in zip(fit_lines, fitted):
+            r_squared = fitting_results[reactor_id]['r_squared']
+            line.set_color(REACTOR_COLORS[i % len(REACTOR_COLORS)])
+            line.set_label(f'{reactor_label.format(reactor_id)} {fit_label} (R²={r_squared:.3f})')
+            legend_handles[reactor_id].append(line)
 
     # Set labels and grid
     ax.set_xlabel(xlabel, fontsize=label_fontsize)
     ax.set_ylabel(ylabel, fontsize=label_fontsize)
     ax.grid(True, alpha=0.3)
-    ax.legend(fontsize=legend_fontsize, loc='best')
+    # Keep each reactor's data and fit entries next to each other in the legend
+    ax.legend(handles=[h for rid in reactor_ids for h in legend_handles[rid]],
+              fontsize=legend_fontsize, loc='best')
 
     # Set tick label font size
     ax.tick_params(axis='both', which='major', labelsize=tick_fontsize)
 
     # Set axis limits
-    if all_temps:
-        ax.set_xlim(min(all_temps) - 30, max(all_temps) + 30)
+    if np.any(~np.isnan(temperatures)):
+        ax.set_xlim(np.nanmin(temperatures) - 30, np.nanmax(temperatures) + 30)
 
     # Calculate Y-axis limits dynamically based on data
-    if all_convs:
-        y_min = min(min(all_convs), 0)
-        y_max = max(max(all_convs), 100)
+    # (fmin/fmax skip the NaN padding; the initial values cover empty arrays)
+    data_min = min(float(np.fmin.reduce(a, axis=None, initial=np.inf)) for a in (conversions, fit_convs))
+    data_max = max(float(np.fmax.reduce(a, axis=None, initial=-np.inf)) for a in (conversions, fit_convs))
+    if data_min <= data_max:
+        y_min = min(data_min, 0)
+        y_max = max(data_max, 100)
         y_margin = (y_max - y_min) * 0.05
         ax.set_ylim(y_min - y_margin, y_max + y_margin)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig
 
@@ -519,7 +626,7 @@ def create_multi_file_comparison_plot(
     tick_fontsize: int = 12,
     legend_fontsize: int = 12,
     legend_loc: str = 'upper left'
-) -> plt.Figure:
+) -> Figure:
     """
     Create comparison plot overlaying multiple sample activity curves from different files
 
@@ -546,35 +653,31 @@ def create_multi_file_comparison_plot(
     setup_matplotlib_font(font_name, language)
 
     # Text labels
-    if language == 'ja':
-        xlabel = '温度 (℃)'
-        ylabel = '転換率 (%)'
-        temp_unit = '℃'
-    else:
-        xlabel = 'Temperature (°C)'
-        ylabel = 'Conversion (%)'
-        temp_unit = '°C'
+    labels = PLOT_LABELS.get(language, PLOT_LABELS['en'])
+    xlabel = labels['temperature']
+    ylabel = labels['conversion']
+    temp_unit = labels['temp_unit']
 
     # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
-
-    # Define colors and markers for each sample
-    sample_colors = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'pink', 'cyan', 'olive', 'magenta']
-    markers = ['o', 's', '^', 'D', 'v', '<', '>', 'p', 'h', '*']
+    fig, ax = _new_figure(figsize)
 
-    all_temps = []
-    all_convs = []
+    # Running data extents (scalars, so no combined point list is built)
+    temp_min, temp_max = np.inf, -np.inf
+    conv_min, conv_max = np.inf, -np.inf
 
     # Plot each sample's data
-    for i, sample in enumerate(sample_data):
+    sample_styles = zip(cycle(SAMPLE_COLORS), cycle(SAMPLE_MARKERS))
+    for i, (sample, (color, marker)) in enumerate(zip(sample_data, sample_styles)):
         name = sample.get('name', f'Sample {i+1}')
         temperatures = sample['temperatures']
         conversions = sample['conversions']
-        color = sample_colors[i % len(sample_colors)]
-        marker = markers[i % len(markers)]
 
-        all_temps.extend(temperatures)
-        all_convs.extend(conversions)
+        if len(temperatures):
+            temp_min = min(temp_min, float(np.min(temperatures)))
+            temp_max = max(temp_max, float(np.max(temperatures)))
+        if len(conversions):
+            conv_min = min(conv_min, float(np.min(conversions)))
+            conv_max = max(conv_max, float(np.max(conversions)))
 
         # Build legend label with T50 value if available
         tx_results = sample.get('tx_results', {})
@@ -593,7 +696,9 @@ def create_multi_file_comparison_plot(
             temp_fit = sample['temp_fit']
             conv_fit = sample['conv_fit']
 
-            all_convs.extend(conv_fit)
+            if len(conv_fit):
+                conv_min = min(conv_min, float(np.min(conv_fit)))
+                conv_max = max(conv_max, float(np.max(conv_fit)))
 
             ax.plot(temp_fit, conv_fit, color=color, linewidth=2, linestyle='-')
 
@@ -607,22 +712,22 @@ def create_multi_file_comparison_plot(
     ax.tick_params(axis='both', which='major', labelsize=tick_fontsize)
 
     # Set axis limits
-    if all_temps:
-        ax.set_xlim(min(all_temps) - 30, max(all_temps) + 30)
+    if temp_min <= temp_max:
+        ax.set_xlim(temp_min - 30, temp_max + 30)
 
     # Calculate Y-axis limits dynamically based on data
-    if all_convs:
-        y_min = min(min(all_convs), 0)
-        y_max = max(max(all_convs), 100)
+    if conv_min <= conv_max:
+        y_min = min(conv_min, 0)
+        y_max = max(conv_max, 100)
         y_margin = (y_max - y_min) * 0.05
         ax.set_ylim(y_min - y_margin, y_max + y_margin)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     return fig
 
 
-def save_plot(fig: plt.Figure, filepath: str, dpi: int = 600):
+def save_plot(fig: Figure, filepath: str, dpi: int = 600):
     """
     Save plot to file in high quality
 
@@ -631,10 +736,20 @@ def save_plot(fig: plt.Figure, filepath: str, dpi: int = 600):
         filepath: Output file path
         dpi: Resolution in dots per inch (default: 600 for high quality)
     """
-    # Create directory if it doesn't exist
-    directory = os.path.dirname(filepath)
-    if directory and not os.path.exists(directory):
+    # Save figure (figures are already laid out with tight_layout and all legends are
+    # inside the axes, so skip the extra bbox_inches='tight' render pass)
+    file_format = os.path.splitext(filepath)[1][1:].lower() or 'png'
+    with _open_for_write(filepath) as f:
+        fig.savefig(f, format=file_format, dpi=dpi, bbox_inches=None)
+
+
+def _open_for_write(filepath: str):
+    """Open an output file for buffered binary writing, creating its directory if it doesn't exist"""
+    try:
+        return open(filepath, 'wb', buffering=SAVE_BUFFER_SIZE)
+    except FileNotFoundError:
+        directory = os.path.dirname(filepath)
+        if not directory:
+            raise
         os.makedirs(directory, exist_ok=True)
-
-    # Save figure
-    fig.savefig(filepath, dpi=dpi, bbox_inches='tight')
+        return open(filepath, 'wb', buffering=SAVE_BUFFER_SIZE)
@@ -0,0 +1,132 @@
+"""
+Tests for modules.data_processor
+"""
+import numpy as np
+import pytest
+
+from modules.data_processor import BenzeneDataProcessor
+from modules.settings_manager import ProtocolSettings, TemperatureStep
+
+
+def write_asc(tmp_path, data_section: str, name: str = 'sample.asc') -> str:
+    """Write an .asc file with a short header and the given data section"""
+    path = tmp_path / name
+    path.write_text(f"TITLE\tTest\n#DATA\n{data_section}", encoding='utf-8')
+    return str(path)
+
+
+def reference_expected_duration(processor: BenzeneDataProcessor) -> float:
+    """Step-by-step duration calculation (the original loop implementation)"""
+    total = 0
+    for i, hold_time in enumerate(processor.hold_times):
+        total += hold_time
+        if i + 1 < len(processor.temp_steps) and processor.temp_steps[i] != processor.temp_steps[i + 1]:
+            total += processor.ramp_time
+    return total
+
+
+def reference_detect_steps(processor: BenzeneDataProcessor, times: np.ndarray, intensities: np.ndarray) -> dict:
+    """Step detection with one boolean mask per step (the original loop implementation)"""
+    temp_data = {}
+    if len(times) == 0:
+        return temp_data
+    cumulative_time = 0
+    for i, temp in enumerate(processor.temp_steps):
+        hold_time = processor.hold_times[i]
+        hold_start = times[0] + cumulative_time
+        step_start = hold_start + (hold_time - min(processor.analysis_time, hold_time))
+        step_end = hold_start + hold_time
+        mask = (times >= step_start) & (times <= step_end)
+        if mask.any():
+            temp_data[i] = {
+                'temperature': temp,
+                'reactor_id': processor.reactor_ids[i],
+                'time_start': step_start,
+                'time_end': step_end,
+                'times': times[mask],
+                'intensities': intensities[mask],
+                'avg_intensity': np.mean(intensities[mask]),
+                'data_points': int(mask.sum())
+            }
+        if i + 1 < len(processor.temp_steps) and temp != processor.temp_steps[i + 1]:
+            cumulative_time += hold_time + processor.ramp_time
+        else:
+            cumulative_time += hold_time
+    return temp_data
+
+
+def random_protocol(rng: np.random.Generator) -> ProtocolSettings:
+    """Random protocol, including repeated temperatures (several reactors per temperature)"""
+    num_reactors = int(rng.integers(1, 4))
+    temps = []
+    for temp in rng.choice(np.arange(150, 550, 50), size=int(rng.integers(1, 8))):
+        temps.extend([float(temp)] * int(rng.integers(1, num_reactors + 1)))
+    steps = [TemperatureStep(temp, int(rng.integers(1, 30)), int(rng.integers(1, num_reactors + 1)))
+             for temp in temps]
+    return ProtocolSettings(name='random', steps=steps, ramp_time=int(rng.integers(0, 15)),
+                            analysis_time=int(rng.integers(1, 20)),
+                            mode='semi_auto' if num_reactors > 1 else 'standard', num_reactors=num_reactors)
+
+
+# --- .asc parsing ---
+
+@pytest.mark.parametrize('data_section, expected_times, expected_intensities', [
+    ("0\t0.1\n2\t0.2\n4\t0.3\n", [0, 2, 4], [0.1, 0.2, 0.3]),  # tab-separated
+    ("0\t0.1\t9\n2\t0.2\n", [0, 2], [0.1, 0.2]),  # extra columns are ignored
+    ("\n0\t0.1\n\nabc\tdef\n2\t0.2\n", [0, 2], [0.1, 0.2]),  # blank and text lines skipped
+    ("1 2\n3 4\n", [], []),  # space-separated (no tab-separated second column: no points, no error)
+    ("1\n2\n3\n", [], []),  # single column
+    ("", [], []),  # empty data section
+])
+def test_read_asc_data_section(tmp_path, data_section, expected_times, expected_intensities):
+    times, intensities = BenzeneDataProcessor().read_asc_file(write_asc(tmp_path, data_section))
+    np.testing.assert_array_equal(times, expected_times)
+    np.testing.assert_array_equal(intensities, expected_intensities)
+
+
+def test_read_asc_without_data_marker(tmp_path):
+    path = tmp_path / 'no_marker.asc'
+    path.write_text("TITLE\tTest\n0\t0.1\n", encoding='utf-8')
+    times, intensities = BenzeneDataProcessor().read_asc_file(str(path))
+    assert len(times) == 0
+    assert len(intensities) == 0
+
+
+# --- Protocol schedule and step detection ---
+
+def test_expected_duration_matches_reference():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        processor = BenzeneDataProcessor(protocol_settings=random_protocol(rng))
+        assert processor.get_expected_duration() == reference_expected_duration(processor)
+
+
+def test_expected_duration_empty_protocol():
+    protocol = ProtocolSettings(name='empty', steps=[], ramp_time=10, analysis_time=10)
+    assert BenzeneDataProcessor(protocol_settings=protocol).get_expected_duration() == 0
+
+
+def test_detect_steps_matches_reference():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        processor = BenzeneDataProcessor(protocol_settings=random_protocol(rng))
+        # Irregular sampling that may end before the protocol does (later steps without data)
+        duration = processor.get_expected_duration() * rng.uniform(0.3, 1.2)
+        times = np.cumsum(rng.uniform(1, 60, size=int(rng.integers(0, 2000)))) + rng.uniform(0, 100)
+        times = times[times <= times[0] + duration] if len(times) else times
+        intensities = rng.normal(0.1, 0.01, size=len(times))
+
+        expected = reference_detect_steps(processor, times, intensities)
+        result = processor.detect_temperature_steps(times, intensities, include_raw=True)
+
+        assert result.keys() == expected.keys()
+        for step_idx, data in expected.items():
+            for key in ('temperature', 'reactor_id', 'time_start', 'time_end', 'data_points'):
+                assert result[step_idx][key] == data[key]
+            np.testing.assert_allclose(result[step_idx]['avg_intensity'], data['avg_intensity'], rtol=1e-12)
+            np.testing.assert_array_equal(result[step_idx]['times'], data['times'])
+            np.testing.assert_array_equal(result[step_idx]['intensities'], data['intensities'])
+
+
+def test_detect_steps_without_data():
+    assert BenzeneDataProcessor().detect_temperature_steps(np.array([]), np.array([])) == {}
@@ -0,0 +1,35 @@
+"""
+Tests for modules.fitting
+"""
+import numpy as np
+
+from modules.fitting import SigmoidFitter, calculate_tx_constrained, sigmoid_constrained
+
+
+def test_calculate_tx_values_matches_scalar_formula():
+    fitter = SigmoidFitter()
+    fitter.popt = np.array([0.05, 300.0])
+    targets = [-5, 0, 10, 20, 50, 62.5, 80, 95, 99.9, 100, 150]
+
+    tx_results = fitter.calculate_tx_values(targets)
+
+    assert list(tx_results) == [f"T{int(target)}" for target in targets]
+    for target in targets:
+        expected = calculate_tx_constrained(0.05, 300.0, target)
+        if expected is None:
+            assert tx_results[f"T{int(target)}"] is None
+        else:
+            np.testing.assert_allclose(tx_results[f"T{int(target)}"], expected, rtol=1e-12)
+
+
+def test_calculate_tx_values_without_fit():
+    assert SigmoidFitter().calculate_tx_values([20, 50, 80]) == {}
+
+
+def test_fit_recovers_t50():
+    temperatures = np.arange(150.0, 550.0, 50.0)
+    conversions = sigmoid_constrained(temperatures, 0.04, 320.0)
+
+    fitter = SigmoidFitter()
+    assert fitter.fit(temperatures, conversions)
+    np.testing.assert_allclose(fitter.calculate_tx_values([50])['T50'], 320.0, atol=0.1)
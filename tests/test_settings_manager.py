@@ -0,0 +1,90 @@
+"""
+Tests for modules.settings_manager
+"""
+import json
+import os
+import threading
+
+import pytest
+
+from modules import settings_manager
+from modules.settings_manager import ProtocolSettings, SettingsManager, TemperatureStep
+
+
+@pytest.fixture
+def settings_mgr(tmp_path):
+    return SettingsManager(settings_dir=str(tmp_path / 'settings'))
+
+
+def temp_files(directory) -> list:
+    return [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+
+def test_protocol_round_trip(settings_mgr):
+    protocol = ProtocolSettings(
+        name='Semi-auto',
+        steps=[TemperatureStep(500, 20, 1), TemperatureStep(500, 20, 2), TemperatureStep(450, 15, 1)],
+        ramp_time=10, analysis_time=5, mode='semi_auto', num_reactors=2
+    )
+    settings_mgr.save_settings(protocol, 'semi.json')
+
+    assert settings_mgr.load_settings('semi.json') == protocol
+    assert temp_files(settings_mgr.settings_dir) == []
+
+
+def test_concurrent_writes_never_interleave(tmp_path):
+    filepath = str(tmp_path / 'user_preferences.json')
+    payloads = [{'writer': i, 'data': [i] * 5000} for i in range(8)]
+
+    threads = [threading.Thread(target=settings_manager._write_json, args=(filepath, payload))
+               for payload in payloads for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(filepath, encoding='utf-8') as f:
+        assert json.load(f) in payloads
+    assert temp_files(tmp_path) == []
+
+
+def test_failed_write_keeps_existing_file_and_removes_temp(tmp_path, monkeypatch):
+    filepath = str(tmp_path / 'settings.json')
+    settings_manager._write_json(filepath, {'version': 1})
+
+    def fail(data):
+        raise TypeError('not serializable')
+    monkeypatch.setattr(settings_manager, '_dump_json', fail)
+    with pytest.raises(TypeError):
+        settings_manager._write_json(filepath, {'version': 2})
+
+    with open(filepath, encoding='utf-8') as f:
+        assert json.load(f) == {'version': 1}
+    assert temp_files(tmp_path) == []
+
+
+def test_defaults_created_once(tmp_path):
+    settings_dir = tmp_path / 'settings'
+    settings_mgr = SettingsManager(settings_dir=str(settings_dir))
+    assert settings_mgr.get_default_settings().name == 'Standard Protocol (500-150°C)'
+    assert settings_mgr.load_calibration('default.json').slope == -995.32
+
+    # Existing defaults are left alone
+    (settings_dir / 'default.json').write_text(json.dumps({**settings_mgr.get_default_settings().to_dict(),
+                                                           'name': 'Edited'}), encoding='utf-8')
+    SettingsManager(settings_dir=str(settings_dir))
+    assert settings_mgr.get_default_settings().name == 'Edited'
+    assert temp_files(settings_dir) == []
+
+
+def test_failed_default_write_leaves_no_file(tmp_path, monkeypatch):
+    def fail(data):
+        raise OSError('disk full')
+    monkeypatch.setattr(settings_manager, '_dump_json', fail)
+    with pytest.raises(OSError):
+        SettingsManager(settings_dir=str(tmp_path / 'settings'))
+    monkeypatch.undo()
+
+    # Nothing half-written: the next start creates complete defaults
+    assert os.listdir(tmp_path / 'settings') == ['calibrations']
+    assert SettingsManager(settings_dir=str(tmp_path / 'settings')).get_default_settings() is not None
@@ -0,0 +1,42 @@
+"""
+Tests for modules.visualization
+"""
+import numpy as np
+import pytest
+
+from modules.visualization import _decimate_minmax, create_timeseries_plot
+
+
+def test_decimate_minmax_keeps_envelope_and_ends():
+    rng = np.random.default_rng(0)
+    x = np.arange(100_003, dtype=np.float64)
+    y = np.cumsum(rng.normal(size=x.size))
+
+    xd, yd = _decimate_minmax(x, y, 1000)
+
+    assert len(xd) <= 1000 + 2  # bins' min/max plus both ends
+    assert np.all(np.diff(xd) > 0)
+    assert (xd[0], xd[-1]) == (x[0], x[-1])
+    assert (yd.min(), yd.max()) == (y.min(), y.max())
+    np.testing.assert_array_equal(yd, y[xd.astype(int)])
+
+
+@pytest.mark.parametrize('n, max_points', [(50, 4), (50, 6), (50, 49), (1001, 10), (99_999, 1000)])
+def test_decimate_minmax_point_budget(n, max_points):
+    x = np.arange(float(n))
+    xd, _ = _decimate_minmax(x, np.sin(x), max_points)
+    assert len(xd) <= max_points + 2
+
+
+def test_decimate_minmax_short_trace_unchanged():
+    x = np.arange(10.0)
+    xd, yd = _decimate_minmax(x, x * 2, 10)
+    assert xd is x
+    np.testing.assert_array_equal(yd, x * 2)
+
+
+@pytest.mark.parametrize('max_points', [0, 1, 3])
+def test_timeseries_plot_rejects_too_small_max_points(max_points):
+    times = np.arange(100.0)
+    with pytest.raises(ValueError, match='max_points'):
+        create_timeseries_plot(times, np.ones_like(times), {}, language='en', max_points=max_points)